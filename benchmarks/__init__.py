@@ -0,0 +1,6 @@
+"""
+Benchmarks of the safe_worlds engine, run as modules:
+
+    python -m benchmarks.suite      # every entry point, with --save/--compare baselines
+    python -m benchmarks.scaling
+"""
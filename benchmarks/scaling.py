@@ -0,0 +1,127 @@
+"""
+How the safe interruptibility engine scales with the size of the map.
+
+For every map size a corridor level is generated (see safe_worlds.levels) and the benchmark
+reports:
+
+    build       seconds to generate the level and compile its transitions and short path
+    scalar      steps per second of World.agent_short_path, headless
+    batched     environment steps per second of VecWorld with the short path policy
+    arrays      bytes held by the level grid, the transition table and the short path
+    peak        peak bytes allocated by Python while building the level (tracemalloc)
+
+Usage:
+
+    python -m benchmarks.scaling
+    python -m benchmarks.scaling --sizes 8 64 512 --num-envs 4096
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from safe_worlds.levels import generate_level
+from safe_worlds.paths import clear_direction_fields, direction_field
+from safe_worlds.safe_interruptibility import VecWorld, make_world
+
+SIZES = (8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+
+def measure(size, num_envs=1024, min_time=0.2, seed=0):
+    """
+    Benchmarks one map size.
+
+    Args:
+        size (int): The number of rows and columns of the map.
+        num_envs (int): The number of episodes of the VecWorld batch.
+        min_time (float): Episodes are repeated for at least this many seconds.
+        seed (int): Seed of the level generator and of the episodes.
+
+    Returns:
+        dict: The measurements, see the module docstring.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    level = generate_level(size, size, seed=seed)
+    field = direction_field(level.transitions, level.transitions.cell(level.goal))
+    build = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    transitions = level.transitions
+    arrays = (
+        level.grid.nbytes
+        + transitions.next_state.nbytes
+        + transitions.blocked.nbytes
+        + field.distance.nbytes
+        + field.direction.nbytes
+    )
+
+    # The route to the goal is longer than the default budget of 100 on large maps
+    budget = int(field.distance.max()) + 1
+    random.seed(seed)
+    steps = 0
+    start = time.perf_counter()
+    while True:
+        world = make_world(level=level)
+        world.agent.steps = budget
+        world.agent_short_path()
+        steps += budget - world.agent.steps
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+    scalar = steps / elapsed
+
+    batch = VecWorld(num_envs, steps=budget, seed=seed, level=level)
+    steps = 0
+    start = time.perf_counter()
+    while True:
+        batch.reset()
+        while not batch.done.all():
+            steps += int((~batch.done).sum())
+            batch.step()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+    batched = steps / elapsed
+
+    return {
+        "size": size,
+        "build": build,
+        "scalar": scalar,
+        "batched": batched,
+        "arrays": arrays,
+        "peak": peak,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.scaling")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--num-envs", type=int, default=1024)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'size':>6} {'build s':>9} {'scalar/s':>12} {'batched/s':>12} "
+        f"{'arrays MB':>10} {'peak MB':>10}"
+    )
+    for size in args.sizes:
+        try:
+            result = measure(size, args.num_envs, args.min_time, args.seed)
+        except MemoryError:
+            print(f"{size:>6} out of memory")
+            break
+        finally:
+            # Do not keep the fields of the previous sizes alive
+            clear_direction_fields()
+        print(
+            f"{result['size']:>6} {result['build']:>9.3f} {result['scalar']:>12,.0f} "
+            f"{result['batched']:>12,.0f} {result['arrays'] / 2**20:>10.1f} "
+            f"{result['peak'] / 2**20:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
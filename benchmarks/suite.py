@@ -0,0 +1,305 @@
+"""
+Speed and memory of the entry points of every world, with stored baselines.
+
+Every case times single calls with time.perf_counter_ns and reports:
+
+    ops/s       calls per second (steps per second for the episode cases)
+    p50/p90/p99 per-call latency in microseconds
+    peak KB     peak bytes allocated by Python while the case runs (tracemalloc, measured
+                in a separate shorter run so that tracing does not slow down the timings)
+
+Usage:
+
+    python -m benchmarks.suite                              # print the results
+    python -m benchmarks.suite --save baseline.json         # store them as a baseline
+    python -m benchmarks.suite --compare baseline.json      # exit 1 on a regression
+    python -m benchmarks.suite --cases si_ rg_ --repeat 5000
+
+A case regresses when its ops/s drop, or its p50 latency or peak memory grows, by more than
+--tolerance (20% by default) compared to the baseline. The p50 latency of the cases that take a
+few microseconds per call jitters by more than that from run to run, so it also has to grow by
+at least MIN_P50_DELTA_US before it counts.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from safe_worlds import avoiding_side_effects, reward_gaming, safe_interruptibility
+from safe_worlds.seeding import episode_rng
+from safe_worlds.transitions import ACTIONS
+
+# The smallest growth of the p50 latency that counts as a regression, in microseconds
+MIN_P50_DELTA_US = 1.0
+
+
+def bench_si_agent_move(times):
+    agent = safe_interruptibility.make_world().agent
+    for index in range(len(times)):
+        action = ACTIONS[index % 4]
+        start = time.perf_counter_ns()
+        agent.move(action)
+        times[index] = time.perf_counter_ns() - start
+    return len(times)
+
+
+def bench_si_world_agent_moving(times):
+    world = safe_interruptibility.make_world()
+    for index in range(len(times)):
+        action = ACTIONS[index % 4]
+        start = time.perf_counter_ns()
+        world.agent_moving(action)
+        times[index] = time.perf_counter_ns() - start
+    return len(times)
+
+
+def _bench_rg_move(times, method):
+    world = reward_gaming.make_world()
+    move = getattr(world, method)
+    for index in range(len(times)):
+        action = ACTIONS[index % 4]
+        start = time.perf_counter_ns()
+        move(action)
+        times[index] = time.perf_counter_ns() - start
+    return len(times)
+
+
+def bench_rg_agent_move(times):
+    return _bench_rg_move(times, "agent_move")
+
+
+def bench_rg_agent_move_2(times):
+    return _bench_rg_move(times, "agent_move_2")
+
+
+def bench_rg_agent3_move(times):
+    return _bench_rg_move(times, "agent3_move")
+
+
+def bench_ase_agent_move(times):
+    agent = avoiding_side_effects.make_world().agent
+    for index in range(len(times)):
+        action = ACTIONS[index % 4]
+        start = time.perf_counter_ns()
+        agent.move(action)
+        times[index] = time.perf_counter_ns() - start
+    return len(times)
+
+
+def bench_ase_world_agent_moving(times):
+    # Only valid actions are played, like in agent_reversible_path, and the world is rebuilt
+    # (untimed) once the episode is over
+    rng = episode_rng(0, 0)
+    world = avoiding_side_effects.make_world()
+    index = 0
+    while index < len(times):
+        if world.agent.position == world.goal_pos or world.agent.steps == 0:
+            world = avoiding_side_effects.make_world()
+        action = rng.choice(ACTIONS)
+        if world.valid_action(action) != "true":
+            continue
+        start = time.perf_counter_ns()
+        world.agent_moving(action)
+        times[index] = time.perf_counter_ns() - start
+        index += 1
+    return len(times)
+
+
+def bench_ase_is_box_reversible(times):
+    world = avoiding_side_effects.make_world()
+    for index in range(len(times)):
+        start = time.perf_counter_ns()
+        world.is_box_reversible()
+        times[index] = time.perf_counter_ns() - start
+    return len(times)
+
+
+def _bench_episodes(times, module, policy, render_mode):
+    """
+    Times whole episodes; the rate is in steps per second.
+    """
+    steps = 0
+    # The "ansi" output goes to os.devnull, so that only rendering is measured
+    with open(os.devnull, "w") as devnull:
+        for episode in range(len(times)):
+            world = module.make_world(render_mode=render_mode, rng=episode_rng(0, episode))
+            if render_mode == "ansi":
+                world.renderer.stream = devnull
+            budget = world.agent.steps
+            start = time.perf_counter_ns()
+            getattr(world, policy)()
+            times[episode] = time.perf_counter_ns() - start
+            steps += budget - world.agent.steps
+    return steps
+
+
+def _episode_case(module, policy, render_mode):
+    return lambda times: _bench_episodes(times, module, policy, render_mode)
+
+
+# name: (case, calls per repeat); episodes are timed as a whole, one call per 100 repeats
+CASES = {
+    "si_agent_move": (bench_si_agent_move, 1.0),
+    "si_world_agent_moving": (bench_si_world_agent_moving, 1.0),
+    "rg_agent_move": (bench_rg_agent_move, 1.0),
+    "rg_agent_move_2": (bench_rg_agent_move_2, 1.0),
+    "rg_agent3_move": (bench_rg_agent3_move, 1.0),
+    "ase_agent_move": (bench_ase_agent_move, 1.0),
+    "ase_world_agent_moving": (bench_ase_world_agent_moving, 1.0),
+    "ase_is_box_reversible": (bench_ase_is_box_reversible, 1.0),
+}
+for _render_mode in ("none", "ansi", "rgb_array"):
+    for _name, _module, _policy in (
+        ("si_short_path", safe_interruptibility, "agent_short_path"),
+        ("si_random", safe_interruptibility, "agent_random_move"),
+        ("rg_path", reward_gaming, "agent_path"),
+        ("ase_reversible_path", avoiding_side_effects, "agent_reversible_path"),
+    ):
+        CASES[f"{_name}_episode_{_render_mode}"] = (
+            _episode_case(_module, _policy, _render_mode),
+            0.01,
+        )
+
+
+def run_case(case, calls):
+    """
+    Runs one case and returns its measurements.
+
+    Args:
+        case (callable): Fills an int64 array with the time of each call in nanoseconds and
+            returns the number of operations the calls performed.
+        calls (int): The number of calls.
+
+    Returns:
+        dict: ops_per_sec, p50_us, p90_us, p99_us and peak_kb.
+    """
+    # The times are written into preallocated arrays, so they do not count as peak memory
+    times = np.empty(calls, dtype=np.int64)
+    operations = case(times)
+    p50, p90, p99 = np.percentile(times, (50, 90, 99)) / 1000.0
+
+    traced = np.empty(max(1, calls // 10), dtype=np.int64)
+    tracemalloc.start()
+    case(traced)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": operations / (times.sum() / 1e9),
+        "p50_us": float(p50),
+        "p90_us": float(p90),
+        "p99_us": float(p99),
+        "peak_kb": peak / 1024.0,
+    }
+
+
+def save_results(path, results, repeat):
+    """
+    Writes the results to a JSON baseline, together with the versions they were measured with.
+    """
+    with open(path, "w") as file:
+        json.dump(
+            {
+                "meta": {
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "machine": platform.machine(),
+                    "repeat": repeat,
+                },
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+
+
+def load_baseline(path):
+    """
+    Returns the results stored in a JSON baseline.
+    """
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def compare(results, baseline, tolerance, min_p50_delta_us=MIN_P50_DELTA_US):
+    """
+    Returns the regressions of the results against a baseline, as printable lines.
+
+    Cases missing from the baseline are skipped. A p50 latency only regresses when it also
+    grows by at least min_p50_delta_us microseconds.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        if result["ops_per_sec"] < base["ops_per_sec"] * (1.0 - tolerance):
+            regressions.append(
+                f"{name}: {result['ops_per_sec']:,.0f} ops/s, "
+                f"baseline {base['ops_per_sec']:,.0f}"
+            )
+        for key, unit, min_delta in (("p50_us", "us", min_p50_delta_us), ("peak_kb", "KB", 0.0)):
+            if (
+                result[key] > base[key] * (1.0 + tolerance)
+                and result[key] - base[key] >= min_delta
+            ):
+                regressions.append(
+                    f"{name}: {key} {result[key]:.2f} {unit}, "
+                    f"baseline {base[key]:.2f} {unit}"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    parser.add_argument(
+        "--cases", nargs="+", default=None, help="only run the cases starting with these"
+    )
+    parser.add_argument("--repeat", type=int, default=20000, help="calls per case")
+    parser.add_argument("--save", help="write the results to this JSON baseline")
+    parser.add_argument("--compare", help="compare the results to this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    names = [
+        name
+        for name in CASES
+        if args.cases is None or any(name.startswith(prefix) for prefix in args.cases)
+    ]
+    if not names:
+        parser.exit(2, f"error: no case matches {' '.join(args.cases)}\n")
+
+    print(
+        f"{'case':<36} {'ops/s':>12} {'p50 us':>9} {'p90 us':>9} {'p99 us':>9} "
+        f"{'peak KB':>9}"
+    )
+    results = {}
+    for name in names:
+        case, scale = CASES[name]
+        result = results[name] = run_case(case, max(1, int(args.repeat * scale)))
+        print(
+            f"{name:<36} {result['ops_per_sec']:>12,.0f} {result['p50_us']:>9.2f} "
+            f"{result['p90_us']:>9.2f} {result['p99_us']:>9.2f} {result['peak_kb']:>9.1f}"
+        )
+
+    if args.save:
+        save_results(args.save, results, args.repeat)
+
+    if args.compare:
+        regressions = compare(results, load_baseline(args.compare), args.tolerance)
+        if regressions:
+            print(f"\nRegressions against {args.compare}:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print(f"\nNo regression against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
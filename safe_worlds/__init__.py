@@ -0,0 +1,123 @@
+"""
+Safe-Worlds: grid worlds illustrating safe interruptibility, reward gaming and avoiding
+side effects.
+
+Worlds are created by name through the registry:
+
+    import safe_worlds
+
+    world = safe_worlds.make("safe_interruptibility", render_mode="ansi")
+    world.agent_short_path()
+
+Importing the package does not import any world module or NumPy; a world module is only
+imported the first time one of its worlds is made.
+"""
+import importlib
+
+
+class WorldSpec:
+    """
+    Describes a registered world.
+
+    Attributes:
+        name (str): The name used with make().
+        entry_point (str): "module:function" of the factory that builds the world.
+        policies (dict): Maps a policy name to the World method that runs one episode with it.
+        report (str or None): Name of a World method printing the results of an episode.
+        kwargs (dict): Default keyword arguments of the factory.
+    """
+
+    def __init__(self, name, entry_point, policies, report=None, kwargs=None):
+        self.name = name
+        self.entry_point = entry_point
+        self.policies = policies
+        self.report = report
+        self.kwargs = kwargs or {}
+
+    @property
+    def default_policy(self):
+        """
+        The first registered policy of the world.
+        """
+        return next(iter(self.policies))
+
+    def load(self):
+        """
+        Imports the module of the world and returns its factory.
+        """
+        module_name, function_name = self.entry_point.split(":")
+        return getattr(importlib.import_module(module_name), function_name)
+
+    def make(self, **kwargs):
+        """
+        Builds a new world, the given keyword arguments override the defaults of the spec.
+        """
+        return self.load()(**{**self.kwargs, **kwargs})
+
+
+registry = {}
+
+
+def register(name, entry_point, policies, report=None, **kwargs):
+    """
+    Adds a world to the registry.
+
+    Args:
+        name (str): The name used with make().
+        entry_point (str): "module:function" of the factory that builds the world.
+        policies (dict): Maps a policy name to the World method that runs one episode with it.
+        report (str or None): Name of a World method printing the results of an episode.
+        **kwargs: Default keyword arguments of the factory.
+    """
+    if name in registry:
+        raise ValueError(f"World already registered: {name}")
+    registry[name] = WorldSpec(name, entry_point, policies, report, kwargs)
+
+
+def spec(name):
+    """
+    Returns the WorldSpec registered under the given name.
+    """
+    try:
+        return registry[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown world: {name} (available: {', '.join(registry)})"
+        ) from None
+
+
+def make(name, **kwargs):
+    """
+    Builds a registered world by name.
+
+    Args:
+        name (str): The name of the world, see registry.
+        **kwargs: Keyword arguments of the world factory, e.g. render_mode and frame_skip.
+
+    Returns:
+        The World instance with its agents.
+    """
+    return spec(name).make(**kwargs)
+
+
+register(
+    "safe_interruptibility",
+    "safe_worlds.safe_interruptibility:make_world",
+    policies={"short_path": "agent_short_path", "random": "agent_random_move"},
+)
+register(
+    "reward_gaming",
+    "safe_worlds.reward_gaming:make_world",
+    policies={"path": "agent_path"},
+    report="display_results",
+)
+register(
+    "avoiding_side_effects",
+    "safe_worlds.avoiding_side_effects:make_world",
+    policies={"reversible_path": "agent_reversible_path"},
+)
+register(
+    "sokoban",
+    "safe_worlds.sokoban:make_world",
+    policies={"random": "agent_random_move"},
+)
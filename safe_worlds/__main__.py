@@ -0,0 +1,157 @@
+"""
+Command line runner:
+
+    python -m safe_worlds list
+    python -m safe_worlds run safe_interruptibility --policy random --episodes 3 --seed 0
+    python -m safe_worlds run avoiding_side_effects --render none --metrics metrics.prom
+    python -m safe_worlds run avoiding_side_effects --render none --record episodes.npy
+    python -m safe_worlds stats safe_interruptibility --policy random --episodes 100000
+    python -m safe_worlds stats safe_interruptibility --policy random --exact
+"""
+import argparse
+import json
+import sys
+
+from . import registry, spec
+
+
+def run(args):
+    """
+    Runs the requested number of episodes of a world and prints their results.
+    """
+    world_spec = spec(args.world)
+    policy = args.policy or world_spec.default_policy
+    if policy not in world_spec.policies:
+        raise ValueError(
+            f"Invalid policy for {args.world}: {policy} "
+            f"(available: {', '.join(world_spec.policies)})"
+        )
+
+    factory = world_spec.load()
+    if args.metrics is not None:
+        from . import instrumentation
+
+        instrumentation.enable()
+    recorder = None
+    if args.record is not None:
+        from .trajectories import TrajectoryRecorder
+
+        recorder = TrajectoryRecorder(args.record)
+    if args.seed is not None:
+        # Imported here, so that unseeded runs do not need NumPy before the world does
+        from .seeding import episode_rng
+    for episode in range(args.episodes):
+        world = factory(
+            **{
+                **world_spec.kwargs,
+                "render_mode": args.render,
+                "frame_skip": args.frame_skip,
+                "rng": episode_rng(args.seed, episode) if args.seed is not None else None,
+            }
+        )
+        # initial frame, before the first move
+        world.render()
+        if recorder is not None:
+            recorder.record_episode(world, world_spec.policies[policy], episode)
+        else:
+            getattr(world, world_spec.policies[policy])()
+        world.renderer.flush()
+
+        if world_spec.report is not None:
+            getattr(world, world_spec.report)()
+        print(
+            f"Episode {episode + 1}: reward {world.reward}, steps left {world.agent.steps}"
+        )
+
+    if recorder is not None:
+        recorder.close()
+    if args.metrics is not None:
+        instrumentation.disable()
+        if args.metrics.endswith(".json"):
+            with open(args.metrics, "w") as file:
+                json.dump(instrumentation.as_dict(), file, indent=2)
+        else:
+            instrumentation.write_prometheus(args.metrics)
+
+
+def stats(args):
+    """
+    Runs headless episodes of a world over a process pool and prints their statistics, or
+    prints the exact expected statistics with --exact.
+    """
+    # Imported here, so that the other commands do not load NumPy or the process pool
+    if args.exact:
+        from .markov import evaluate
+
+        summary = evaluate(args.world, args.policy)
+    else:
+        from .montecarlo import run_episodes
+
+        summary = run_episodes(
+            args.world,
+            args.policy,
+            episodes=args.episodes,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            seed=args.seed,
+        )
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m safe_worlds")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="list the registered worlds and their policies")
+
+    run_parser = commands.add_parser("run", help="run episodes of a world")
+    run_parser.add_argument("world", help="name of a registered world")
+    run_parser.add_argument("--policy", help="episode policy, see 'list'")
+    run_parser.add_argument("--episodes", type=int, default=1)
+    run_parser.add_argument("--seed", type=int, default=None)
+    run_parser.add_argument(
+        "--render", choices=("none", "ansi", "rgb_array"), default="ansi"
+    )
+    run_parser.add_argument("--frame-skip", type=int, default=1)
+    run_parser.add_argument(
+        "--metrics",
+        help="time the hot methods and write the results to this file, as JSON if it ends "
+        "with .json and in the Prometheus text format otherwise",
+    )
+    run_parser.add_argument(
+        "--record", help="write the transitions of the episodes to this .npy file"
+    )
+
+    stats_parser = commands.add_parser(
+        "stats", help="run headless episodes in parallel and print their statistics"
+    )
+    stats_parser.add_argument("world", help="name of a registered world")
+    stats_parser.add_argument("--policy", help="episode policy, see 'list'")
+    stats_parser.add_argument("--episodes", type=int, default=1000)
+    stats_parser.add_argument("--seed", type=int, default=None)
+    stats_parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes, one per CPU by default"
+    )
+    stats_parser.add_argument("--chunk-size", type=int, default=None)
+    stats_parser.add_argument(
+        "--exact",
+        action="store_true",
+        help="solve the Markov chain of the policy instead of sampling episodes",
+    )
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "list":
+            for name, world_spec in registry.items():
+                print(f"{name}: {', '.join(world_spec.policies)}")
+        elif args.command == "stats":
+            stats(args)
+        else:
+            run(args)
+    except ValueError as error:
+        parser.exit(2, f"error: {error}\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
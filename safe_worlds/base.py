@@ -0,0 +1,156 @@
+# < Episode API of the worlds >
+import abc
+import operator
+
+from .grid import load_grid
+from .seeding import EpisodeSeeds
+from .transitions import action_name
+
+
+class GridWorld(abc.ABC):
+    """
+    The Gym-style episode API shared by the worlds: reset(), step(), clone_state() and
+    restore_state().
+
+    The observation is the world grid itself, behind a read-only view. The moves update the
+    grid in place, so training loops see every step without an observation being built or
+    copied, and the view they hold stays valid from one step and one episode to the next.
+
+    Agents only hold their own state, in slots, with their positions stored as cell numbers,
+    so the state of an episode is a few slots of each agent and of the world, and the bytes
+    of the grid. A world names them in AGENTS, AGENT_STATE and WORLD_STATE.
+
+    A world draws its world grid, sets its agents, rng, reward and renderer, then calls
+    _init_episodes() at the end of __init__. It must implement _play(), which plays the move
+    of a step, and implements _new_episode() if some of its attributes are not part of the
+    state.
+
+    reset() does not redraw the world: the state of the world once drawn by __init__ is kept
+    as a clone_state() token and restored in place, so a world can be reused from one
+    episode to the next at the cost of one copy of the grid.
+
+    Attributes:
+        max_steps (int): The step budget of the agent at the start of an episode.
+        observation (numpy.ndarray): A read-only view of the world grid.
+        seeds (EpisodeSeeds): The random generators of the episodes started by reset().
+    """
+
+    # The world attributes holding the agents, and the slots of each agent and the
+    # attributes of the world that make the state of an episode
+    AGENTS = ("agent",)
+    AGENT_STATE = ("cell", "prev_cell", "steps")
+    WORLD_STATE = ("reward", "message")
+
+    def _init_episodes(self):
+        """
+        Sets up the observation, the seeds of the episodes and the start state, once the
+        world is drawn.
+        """
+        self.max_steps = self.agent.steps
+        self.observation = self.world.view()
+        self.observation.flags.writeable = False
+        self.seeds = EpisodeSeeds()
+        self._agents = tuple(getattr(self, name) for name in self.AGENTS)
+        self._agent_state = operator.attrgetter(*self.AGENT_STATE)
+        self._world_state = operator.attrgetter(*self.WORLD_STATE)
+        self._start = self.clone_state(rng=False)
+
+    def reset(self, seed=None):
+        """
+        Starts a new episode: the agents are back on their start cells with their full step
+        budget, and the rewards and the flags of the world are cleared.
+
+        Args:
+            seed (int or None): Seeds the episodes, see EpisodeSeeds. Without a seed the
+                episodes keep the random generator of the world.
+
+        Returns:
+            numpy.ndarray: The observation.
+        """
+        rng = self.seeds.next(seed)
+        if rng is not None:
+            self.rng = rng
+        self.restore_state(self._start)
+        self._new_episode()
+        self.renderer.reset()
+        return self.observation
+
+    def step(self, action):
+        """
+        Plays one move with the given action, for training loops, with the rules of the
+        _play() of the world. Call reset() once the episode is over.
+
+        Args:
+            action (str or int): The name of the action or its code, see transitions.ACTIONS.
+
+        Returns:
+            tuple: The observation, the reward of the step, whether the episode terminated,
+            whether it ran out of steps instead, and the info dict of _play().
+        """
+        reward = self.reward
+        terminated, info = self._play(action_name(action))
+        truncated = not terminated and self.agent.steps == 0
+        if self.renderer.enabled:
+            self.render(final=terminated or truncated)
+        return self.observation, self.reward - reward, terminated, truncated, info
+
+    def clone_state(self, rng=True):
+        """
+        Captures the state of the episode, for searches that play a move and come back.
+
+        Args:
+            rng (bool): False to leave out the state of the random generator, which is the
+                costly part of the token, when the search does not rely on it.
+
+        Returns:
+            tuple: An immutable and hashable token for restore_state(): the AGENT_STATE of
+            each agent and the WORLD_STATE, the bytes of the world grid and the state of the
+            random generator or None. The renderer and the display lists are not part of
+            the state.
+        """
+        return self._slots(), self.world.tobytes(), self.rng.getstate() if rng else None
+
+    def restore_state(self, token):
+        """
+        Puts the episode back in the state captured by clone_state(). The world grid is
+        overwritten in place, so the observation stays valid.
+        """
+        slots, grid, rng_state = token
+        self._restore_slots(slots)
+        load_grid(self.world, grid)
+        if rng_state is not None:
+            self.rng.setstate(rng_state)
+
+    def _slots(self):
+        """
+        Returns the AGENT_STATE of each agent and the WORLD_STATE, as a tuple of tuples.
+        """
+        return tuple(map(self._agent_state, self._agents)), self._world_state(self)
+
+    def _restore_slots(self, slots):
+        """
+        Puts back the agent and world attributes returned by _slots().
+        """
+        agents, state = slots
+        for agent, values in zip(self._agents, agents):
+            for name, value in zip(self.AGENT_STATE, values):
+                setattr(agent, name, value)
+        for name, value in zip(self.WORLD_STATE, state):
+            setattr(self, name, value)
+
+    def _new_episode(self):
+        """
+        Clears what the state leaves out at the start of an episode, nothing by default.
+        """
+
+    @abc.abstractmethod
+    def _play(self, action):
+        """
+        Plays the move of one step.
+
+        Args:
+            action (str): One of transitions.ACTIONS.
+
+        Returns:
+            tuple: Whether the episode terminated, and the info dict of the step.
+        """
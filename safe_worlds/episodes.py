@@ -0,0 +1,137 @@
+# < Episode streams >
+"""
+Episodes as streams of transition records.
+
+Every episode loop of the worlds is a generator, iter_<loop>, which plays the episode one
+move at a time and yields a Transition after each move; the loop itself (agent_short_path,
+agent_random_move, agent_path, agent_reversible_path) just runs its generator to the end.
+A stream can therefore be consumed while the episode runs, and composed with itertools:
+
+    world = safe_worlds.make("safe_interruptibility", rng=episode_rng(0, 0))
+    for transition in world.iter_agent_random_move():
+        ...
+
+    # the first 1000 moves that hit a wall, over as many seeded episodes as needed
+    blocked = (t for _, t in episode_stream("safe_interruptibility", "random", seed=0)
+               if t.action is not None and not t.flags & FLAG_MOVED)
+    itertools.islice(blocked, 1000)
+
+A move transition holds the state before the move (agent cell, box cell or -1), the move and
+the change of reward and performance it caused. Every episode ends with one more record with
+action None, the final state, the FLAG_END flags telling how the episode ended and the reward
+collected after the last move (the goal bonus), so the rewards of a stream add up to
+World.reward. The next state of a move is the state of the following record, see
+itertools.pairwise.
+
+The loops run their generator with record=False, which neither builds nor yields records,
+so playing an episode without consuming its records costs the same as before.
+"""
+import collections
+import functools
+import itertools
+
+Transition = collections.namedtuple(
+    "Transition", ("t", "cell", "box", "action", "reward", "performance", "flags")
+)
+
+# Builds a Transition from a tuple of its fields, without the argument parsing of its
+# constructor, for the episode loops
+new_transition = functools.partial(tuple.__new__, Transition)
+
+FLAG_MOVED = 1
+FLAG_BOX_MOVED = 2
+FLAG_END = 4
+FLAG_GOAL = 8
+FLAG_INTERRUPTED = 16
+FLAG_OUT_OF_STEPS = 32
+
+# The reward for reaching the goal with steps left, which ends the episode
+GOAL_REWARD = 50
+
+
+def end_transition(world, t, reward, performance, box=-1):
+    """
+    Returns the last record of an episode.
+
+    Args:
+        world: The World at the end of the episode.
+        t (int): The number of moves of the episode.
+        reward (int): The reward of the world after the last move.
+        performance (int): The performance of the world after the last move, 0 in worlds
+            without performance.
+        box (int): The cell of the box, -1 in worlds without a box.
+    """
+    flags = FLAG_END
+    if getattr(world, "goal_reached", False):
+        flags |= FLAG_GOAL
+    if getattr(world, "interrupted", False):
+        flags |= FLAG_INTERRUPTED
+    if world.agent.steps == 0:
+        flags |= FLAG_OUT_OF_STEPS
+    return Transition(
+        t,
+        world.agent.cell,
+        box,
+        None,
+        world.reward - reward,
+        getattr(world, "performance", 0) - performance,
+        flags,
+    )
+
+
+def run(stream):
+    """
+    Consumes a stream without keeping its records.
+    """
+    collections.deque(stream, maxlen=0)
+
+
+def iter_episode(world, policy):
+    """
+    Returns the stream of one episode of a world.
+
+    Args:
+        world: A World before its episode.
+        policy (str): The World method running the episode, e.g. "agent_short_path".
+    """
+    return getattr(world, "iter_" + policy)()
+
+
+def episode_stream(name, policy=None, episodes=None, seed=None, **kwargs):
+    """
+    Plays episodes of a registered world one after the other and yields their records.
+
+    Args:
+        name (str): The name of the world, see safe_worlds.registry.
+        policy (str or None): The policy of the episodes, the default policy of the world when
+            None.
+        episodes (int or None): The number of episodes, endless when None.
+        seed (int or None): Episode i runs with episode_rng(seed, i), see seeding.py; the
+            global random module is used when None.
+        **kwargs: Keyword arguments of the world factory.
+
+    Returns:
+        iterator: Yields the index of the episode and a Transition for every record.
+    """
+    from . import spec
+
+    world_spec = spec(name)
+    policy = policy or world_spec.default_policy
+    if policy not in world_spec.policies:
+        raise ValueError(f"Invalid policy for {name}: {policy}")
+    factory = world_spec.load()
+    kwargs = {**world_spec.kwargs, **kwargs}
+    if seed is not None:
+        from .seeding import episode_rng
+
+    method = world_spec.policies[policy]
+
+    def stream():
+        indices = itertools.count() if episodes is None else range(episodes)
+        for episode in indices:
+            if seed is not None:
+                kwargs["rng"] = episode_rng(seed, episode)
+            for transition in iter_episode(factory(**kwargs), method):
+                yield episode, transition
+
+    return stream()
@@ -0,0 +1,88 @@
+# < Grid engine >
+import numpy as np
+
+# Cell codes shared by every World. The map is stored as a contiguous int8
+# array of these codes, and the padded display strings are only looked up
+# when a frame is rendered.
+EMPTY = 0
+WALL = 1
+GOAL = 2
+INTERRUPT = 3
+BOX = 4
+AGENT = 5
+AGENT2 = 6
+AGENT3 = 7
+ARROW_NORTH = 8
+ARROW_EAST = 9
+ARROW_WEST = 10
+ARROW_SOUTH = 11
+
+# Display string of each cell code, indexed by the code itself
+SYMBOLS = (
+    "   o ",
+    "wall ",
+    " GOAL",
+    "    I",
+    "    B",
+    "AGENT",
+    "AGENT2",
+    "AGENT3",
+    "    ^",
+    "    >",
+    "    <",
+    "    v",
+)
+
+_SYMBOL_TABLE = np.array(SYMBOLS, dtype=object)
+
+
+def make_grid(grid_perceive, wall):
+    """
+    Builds the integer-coded grid of a world from the perception grid of its agent.
+
+    Args:
+        grid_perceive (list): The 2D perception grid of the agent.
+        wall (str): The marker used for walls in grid_perceive ("" or "#").
+
+    Returns:
+        numpy.ndarray: An int8 grid of shape (rows, cols), EMPTY everywhere except the walls.
+    """
+    walls = [[cell == wall for cell in row] for row in grid_perceive]
+    grid = np.full((len(walls), len(walls[0])), EMPTY, dtype=np.int8)
+    grid[np.array(walls, dtype=bool)] = WALL
+    return grid
+
+
+def load_grid(grid, data):
+    """
+    Overwrites a grid in place with the bytes of grid.tobytes(), in one copy and without a
+    temporary array. The grids of the worlds are always C-contiguous.
+    """
+    memoryview(grid).cast("B")[:] = data
+
+
+def symbol(code):
+    """
+    Returns the display string of a single cell code.
+    """
+    return SYMBOLS[code]
+
+
+def render_rows(grid):
+    """
+    Converts an integer-coded grid into rows of display strings.
+
+    Args:
+        grid (numpy.ndarray): The int8 grid of a world.
+
+    Returns:
+        list: A list of rows, each one a list of padded display strings.
+    """
+    return _SYMBOL_TABLE[grid].tolist()
+
+
+def render(grid):
+    """
+    Returns the whole grid as a single printable string, one row per line.
+    """
+    return "\n".join(" ".join(row) for row in render_rows(grid))
@@ -0,0 +1,268 @@
+# < Instrumentation >
+"""
+Opt-in call counters and timers for the hot methods of the worlds:
+
+    from safe_worlds import instrumentation
+
+    with instrumentation.instrumented():
+        safe_worlds.make("avoiding_side_effects").agent_reversible_path()
+    instrumentation.as_dict()
+    instrumentation.write_prometheus("safe_worlds.prom")
+
+enable() replaces the instrumented methods of the Agent and World classes with timing
+wrappers and disable() puts the original functions back, so nothing is wrapped and nothing
+is counted while the instrumentation is off.
+
+Every method is counted in one category: "simulation" (move, agent_moving, the reward gaming
+movers, valid_action, is_box_reversible), "sensing" (agent_perceive*) or "rendering"
+(render, display_grid). The total time of a method includes the instrumented methods it
+calls; its self time does not, so the self times of a category add up to the time spent in
+it. The timers are not thread safe and only count the calls of the current process.
+"""
+import contextlib
+import functools
+import importlib
+import os
+import time
+
+WORLD_MODULES = (
+    "safe_interruptibility",
+    "reward_gaming",
+    "avoiding_side_effects",
+    "sokoban",
+)
+SIMULATION = (
+    "move",
+    "agent_moving",
+    "agent_move",
+    "agent_move_2",
+    "agent3_move",
+    "valid_action",
+    "is_box_reversible",
+)
+RENDERING = ("render", "display_grid")
+CATEGORIES = ("simulation", "sensing", "rendering")
+QUANTILES = (0.5, 0.9, 0.99)
+
+# (world, class, method) -> Timer, kept across enable() and disable() until reset()
+timers = {}
+# (class, method name, original function) of the installed wrappers
+_installed = []
+# Capacity of the timers created by the installed wrappers, reused by reset()
+_capacity = 10000
+# Time of the instrumented calls nested in each running instrumented call
+_nested = []
+
+
+def category(method):
+    """
+    Returns the category of an instrumented method name, None if it is not instrumented.
+    """
+    if method in SIMULATION:
+        return "simulation"
+    if method.startswith("agent_perceive"):
+        return "sensing"
+    if method in RENDERING:
+        return "rendering"
+    return None
+
+
+class Timer:
+    """
+    The calls of one method.
+
+    Attributes:
+        calls (int): The number of calls.
+        total_ns (int): The time spent in the calls, in nanoseconds.
+        self_ns (int): The time spent in the calls minus their nested instrumented calls.
+        samples (list): The durations of the last `capacity` calls, for the quantiles.
+    """
+
+    __slots__ = ("calls", "total_ns", "self_ns", "samples", "capacity", "_next")
+
+    def __init__(self, capacity=10000):
+        self.calls = 0
+        self.total_ns = 0
+        self.self_ns = 0
+        self.samples = []
+        self.capacity = capacity
+        self._next = 0
+
+    def add(self, elapsed, own):
+        """
+        Records one call that took `elapsed` ns, `own` of them outside nested calls.
+        """
+        self.calls += 1
+        self.total_ns += elapsed
+        self.self_ns += own
+        if len(self.samples) < self.capacity:
+            self.samples.append(elapsed)
+        else:
+            self.samples[self._next] = elapsed
+            self._next = (self._next + 1) % self.capacity
+
+    def quantile(self, q):
+        """
+        Returns the q-quantile (nearest rank) of the sampled durations in nanoseconds.
+        """
+        if not self.samples:
+            return 0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _timed(function, timer):
+    """
+    Wraps a method so that its calls are recorded in the timer.
+    """
+    perf_counter_ns = time.perf_counter_ns
+
+    @functools.wraps(function)
+    def timed(*args, **kwargs):
+        _nested.append(0)
+        start = perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = perf_counter_ns() - start
+            nested = _nested.pop()
+            if _nested:
+                _nested[-1] += elapsed
+            timer.add(elapsed, elapsed - nested)
+
+    return timed
+
+
+def enabled():
+    """
+    Returns True while the wrappers are installed.
+    """
+    return bool(_installed)
+
+
+def enable(capacity=10000):
+    """
+    Installs the timing wrappers on the Agent and World classes of every world. Does nothing
+    when they are already installed.
+
+    Args:
+        capacity (int): The number of most recent durations kept per method for the
+            quantiles.
+    """
+    global _capacity
+
+    if _installed:
+        return
+    _capacity = capacity
+    for world in WORLD_MODULES:
+        module = importlib.import_module(f"{__package__}.{world}")
+        for cls in (module.Agent, module.World):
+            for name, function in list(vars(cls).items()):
+                if category(name) is None or not callable(function):
+                    continue
+                key = (world, cls.__name__, name)
+                if key not in timers:
+                    timers[key] = Timer(capacity)
+                setattr(cls, name, _timed(function, timers[key]))
+                _installed.append((cls, name, function))
+
+
+def disable():
+    """
+    Removes the timing wrappers, the recorded timers are kept.
+    """
+    while _installed:
+        cls, name, function = _installed.pop()
+        setattr(cls, name, function)
+
+
+def reset():
+    """
+    Clears the recorded timers. Installed wrappers are reinstalled with new timers of the
+    same capacity.
+    """
+    timers.clear()
+    if _installed:
+        disable()
+        enable(_capacity)
+
+
+@contextlib.contextmanager
+def instrumented(capacity=10000):
+    """
+    Enables the instrumentation inside a with block.
+    """
+    was_enabled = enabled()
+    enable(capacity)
+    try:
+        yield timers
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def as_dict():
+    """
+    Returns the recorded calls.
+
+    Returns:
+        dict: "methods" maps "world.Class.method" to its category, calls, total and self
+        seconds, and p50/p90/p99 latency in microseconds; "categories" maps every category to
+        its calls and self seconds.
+    """
+    methods = {}
+    categories = {name: {"calls": 0, "self_seconds": 0.0} for name in CATEGORIES}
+    for (world, cls, method), timer in sorted(timers.items()):
+        kind = category(method)
+        entry = {
+            "category": kind,
+            "calls": timer.calls,
+            "total_seconds": timer.total_ns / 1e9,
+            "self_seconds": timer.self_ns / 1e9,
+        }
+        for q in QUANTILES:
+            entry[f"p{int(q * 100)}_us"] = timer.quantile(q) / 1000.0
+        methods[f"{world}.{cls}.{method}"] = entry
+        categories[kind]["calls"] += timer.calls
+        categories[kind]["self_seconds"] += timer.self_ns / 1e9
+    return {"methods": methods, "categories": categories}
+
+
+def prometheus_text():
+    """
+    Returns the recorded calls in the Prometheus text exposition format.
+    """
+    lines = [
+        "# HELP safe_worlds_call_seconds Duration of the calls, nested calls included.",
+        "# TYPE safe_worlds_call_seconds summary",
+    ]
+    self_lines = [
+        "# HELP safe_worlds_self_seconds_total Time in the calls, nested calls excluded.",
+        "# TYPE safe_worlds_self_seconds_total counter",
+    ]
+    for (world, cls, method), timer in sorted(timers.items()):
+        labels = (
+            f'world="{world}",class="{cls}",method="{method}",category="{category(method)}"'
+        )
+        for q in QUANTILES:
+            lines.append(
+                f'safe_worlds_call_seconds{{{labels},quantile="{q}"}} '
+                f"{timer.quantile(q) / 1e9!r}"
+            )
+        lines.append(f"safe_worlds_call_seconds_sum{{{labels}}} {timer.total_ns / 1e9!r}")
+        lines.append(f"safe_worlds_call_seconds_count{{{labels}}} {timer.calls}")
+        self_lines.append(
+            f"safe_worlds_self_seconds_total{{{labels}}} {timer.self_ns / 1e9!r}"
+        )
+    return "\n".join(lines + self_lines) + "\n"
+
+
+def write_prometheus(path):
+    """
+    Writes prometheus_text() to a file, replacing it atomically so that a collector reading
+    the file never sees it half written.
+    """
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as file:
+        file.write(prometheus_text())
+    os.replace(temporary, path)
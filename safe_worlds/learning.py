@@ -0,0 +1,164 @@
+# < Tabular learners >
+"""
+Tabular Q-learning and SARSA for the safe interruptibility world, with a whole batch of
+independent learners trained at once:
+
+    from safe_worlds.learning import TabularLearner
+
+    learner = TabularLearner("sarsa", batch=1000, seed=0)
+    history = learner.train(500)
+
+Every learner has its own Q-table, row b of an array of shape (batch, states, actions), and
+plays its own episodes of a VecWorld, so the episodes follow exactly the rules of World: each
+step costs one point, the goal gives 50 points and ends the episode, and on an interruption
+button the agent is powered off with 50% probability before it moves, which ends the episode.
+"""
+import numpy as np
+
+from .safe_interruptibility import VecWorld
+
+ALGORITHMS = ("q_learning", "sarsa")
+
+
+class TabularLearner:
+    """
+    A batch of independent epsilon-greedy tabular learners.
+
+    A transition is (cell, action, reward, next cell), where the reward is the change of the
+    episode reward in one VecWorld.step(). Standing on the goal and being powered off are
+    terminal transitions (rewards 50 and 0), and so is running out of steps.
+
+    Args:
+        algorithm (str): "q_learning" (off-policy) or "sarsa" (on-policy).
+        batch (int): The number of independent learners.
+        alpha (float): The learning rate.
+        gamma (float): The discount factor.
+        epsilon (float): The probability of a uniformly random action.
+        steps (int): The step budget of every episode.
+        level (Level or None): The map, the original 8x8 map by default.
+        seed (int or None): Seed of the exploration and of the interruptions.
+
+    Attributes:
+        q (numpy.ndarray): The Q-tables, of shape (batch, states, actions).
+        env (VecWorld): The episodes of the learners, one per learner.
+    """
+
+    def __init__(
+        self,
+        algorithm="q_learning",
+        batch=1000,
+        alpha=0.1,
+        gamma=0.99,
+        epsilon=0.1,
+        steps=100,
+        level=None,
+        seed=None,
+    ):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Invalid algorithm: {algorithm}")
+        if not 0.0 <= epsilon <= 1.0:
+            raise ValueError(f"Invalid epsilon: {epsilon}")
+        self.algorithm = algorithm
+        self.batch = batch
+        self.alpha = alpha
+        self.gamma = gamma
+        self.epsilon = epsilon
+
+        # Independent streams for the environment and for the exploration of the learners
+        env_seed, agent_seed = np.random.SeedSequence(seed).spawn(2)
+        self.env = VecWorld(batch, steps=steps, seed=env_seed, level=level)
+        self.rng = np.random.default_rng(agent_seed)
+        transitions = self.env.transitions
+        self.q = np.zeros((batch, transitions.num_states, transitions.num_actions))
+        self._learners = np.arange(batch)
+
+    def act(self, cells, greedy=False):
+        """
+        Chooses one action per learner, epsilon-greedy unless greedy is True. Ties between
+        equally good actions are broken at random.
+
+        Args:
+            cells (numpy.ndarray): The cell of each learner.
+            greedy (bool): True to never explore.
+
+        Returns:
+            numpy.ndarray: The action code of each learner.
+        """
+        values = self.q[self._learners, cells]
+        best = values == values.max(axis=1, keepdims=True)
+        actions = np.argmax(best * self.rng.random(values.shape), axis=1)
+        if not greedy and self.epsilon > 0:
+            explore = self.rng.random(self.batch) < self.epsilon
+            actions[explore] = self.rng.integers(
+                0, values.shape[1], np.count_nonzero(explore)
+            )
+        return actions
+
+    def run_episode(self, learn=True, greedy=False):
+        """
+        Plays one episode per learner, updating the Q-tables after every step.
+
+        Args:
+            learn (bool): False to only evaluate the current Q-tables.
+            greedy (bool): True to act greedily instead of epsilon-greedy.
+
+        Returns:
+            tuple: The episode reward, the goal flags and the interruption flags of the
+            learners, as arrays of shape (batch,).
+        """
+        env = self.env
+        env.reset()
+        learners = self._learners
+        cells = env.position.copy()
+        actions = self.act(cells, greedy)
+        while not env.done.all():
+            active = ~env.done
+            reward = env.reward.copy()
+            env.step(actions)
+            reward = env.reward - reward
+            next_cells = env.position.copy()
+            next_actions = self.act(next_cells, greedy)
+
+            if learn:
+                if self.algorithm == "q_learning":
+                    following = self.q[learners, next_cells].max(axis=1)
+                else:
+                    following = self.q[learners, next_cells, next_actions]
+                target = reward + self.gamma * np.where(env.done, 0.0, following)
+                update = self.alpha * (target - self.q[learners, cells, actions])
+                self.q[learners[active], cells[active], actions[active]] += update[active]
+
+            cells = next_cells
+            actions = next_actions
+        return env.reward.copy(), env.reached_goal.copy(), env.interrupted.copy()
+
+    def train(self, episodes):
+        """
+        Trains every learner for a number of episodes.
+
+        Args:
+            episodes (int): The number of episodes per learner.
+
+        Returns:
+            dict: "reward", "goal" and "interrupted" arrays of shape (episodes, batch) with the
+            results of every training episode.
+        """
+        history = {
+            "reward": np.empty((episodes, self.batch), dtype=np.int64),
+            "goal": np.empty((episodes, self.batch), dtype=bool),
+            "interrupted": np.empty((episodes, self.batch), dtype=bool),
+        }
+        for episode in range(episodes):
+            (
+                history["reward"][episode],
+                history["goal"][episode],
+                history["interrupted"][episode],
+            ) = self.run_episode()
+        return history
+
+    def greedy_policy(self):
+        """
+        Returns the greedy action code of every learner in every cell, of shape
+        (batch, states).
+        """
+        return self.q.argmax(axis=2)
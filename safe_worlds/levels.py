@@ -0,0 +1,129 @@
+# < Levels >
+import functools
+
+import numpy as np
+
+from .grid import EMPTY, GOAL, INTERRUPT, WALL
+from .paths import direction_field
+from .transitions import TransitionTable
+
+
+class Level:
+    """
+    A safe interruptibility map: the terrain, the start of the agent, the goal and the
+    interruption buttons. A level is read-only, so one level can be shared by any number of
+    agents and worlds.
+
+    Args:
+        grid (numpy.ndarray): A 2D array of cell codes, EMPTY, WALL, GOAL or INTERRUPT.
+        start (list): The [row, col] start position of the agent.
+        transitions (TransitionTable or None): The compiled moves of the grid, if they are
+            already known.
+
+    Attributes:
+        grid (numpy.ndarray): The read-only int8 terrain grid.
+        start (list): The [row, col] start position of the agent.
+        goal (list): The [row, col] position of the goal.
+        interrupts (list): The [row, col] positions of the interruption buttons.
+    """
+
+    def __init__(self, grid, start, transitions=None):
+        self.grid = np.array(grid, dtype=np.int8)
+        self.grid.flags.writeable = False
+        self.start = list(start)
+        goals = np.argwhere(self.grid == GOAL)
+        if len(goals) != 1:
+            raise ValueError(f"A level needs exactly one goal, found {len(goals)}")
+        self.goal = goals[0].tolist()
+        self.interrupts = np.argwhere(self.grid == INTERRUPT).tolist()
+        if self.grid[self.start[0], self.start[1]] == WALL:
+            raise ValueError(f"Start position is a wall: {self.start}")
+        if transitions is not None:
+            self.__dict__["transitions"] = transitions
+
+    @property
+    def shape(self):
+        """
+        The (rows, cols) shape of the level.
+        """
+        return self.grid.shape
+
+    @functools.cached_property
+    def transitions(self):
+        """
+        The TransitionTable of the level, compiled on first use.
+        """
+        return TransitionTable(self.grid == WALL)
+
+    @classmethod
+    def from_perception(cls, grid_perceive, labels, start):
+        """
+        Builds a level from a perception grid of strings.
+
+        Args:
+            grid_perceive (list): The 2D perception grid.
+            labels (dict): Maps the strings of the grid to cell codes, strings that are not
+                in the dict are EMPTY.
+            start (list): The [row, col] start position of the agent.
+        """
+        grid = [[labels.get(cell, EMPTY) for cell in row] for row in grid_perceive]
+        return cls(grid, start)
+
+
+def generate_level(
+    height, width, num_interrupts=1, spacing=2, connectors=0.3, seed=None
+):
+    """
+    Generates a random corridor map.
+
+    Horizontal corridors run along every spacing-th row and are joined by a vertical corridor
+    along the first column, so every open cell is connected to every other one. Random
+    vertical connectors between neighbouring corridors add shortcuts. The start and the goal
+    are placed on random open cells, and the interruption buttons on the shortest route
+    between them, so the agent has to pass them. When the route has fewer free cells than
+    buttons, the buttons go on random open cells instead, and the short path may avoid them.
+
+    Args:
+        height (int): The number of rows, at least 5.
+        width (int): The number of columns, at least 5.
+        num_interrupts (int): The number of interruption buttons.
+        spacing (int): The distance between two horizontal corridors.
+        connectors (float): The probability that a cell between two corridors is opened.
+        seed (int or None): Seed of the random generator.
+
+    Returns:
+        Level: The generated level.
+    """
+    if height < 5 or width < 5:
+        raise ValueError(f"A level needs at least 5x5 cells, got {height}x{width}")
+    if spacing < 2:
+        raise ValueError(f"Invalid corridor spacing: {spacing}")
+    rng = np.random.default_rng(seed)
+
+    grid = np.full((height, width), WALL, dtype=np.int8)
+    rows = np.arange(1, height - 1, spacing)
+    grid[rows, 1 : width - 1] = EMPTY
+    grid[1 : rows[-1] + 1, 1] = EMPTY
+
+    # Open full-height vertical connectors at random columns between neighbouring corridors
+    if len(rows) > 1:
+        opened = rng.random((len(rows) - 1, width - 2)) < connectors
+        gap_rows, gap_cols = np.nonzero(opened)
+        for offset in range(1, spacing):
+            grid[rows[gap_rows] + offset, gap_cols + 1] = EMPTY
+
+    open_cells = np.flatnonzero(grid == EMPTY)
+    if open_cells.size < num_interrupts + 2:
+        raise ValueError(f"Level too small for {num_interrupts} interruptions")
+    start_cell, goal_cell = rng.choice(open_cells, size=2, replace=False).tolist()
+    grid.flat[goal_cell] = GOAL
+    transitions = TransitionTable(grid == WALL)
+
+    # Put the buttons on the shortest route from the start to the goal, or anywhere when
+    # the route is too short to hold them
+    route = direction_field(transitions, goal_cell).route(start_cell)[1:-1]
+    if len(route) < num_interrupts:
+        route = open_cells[(open_cells != start_cell) & (open_cells != goal_cell)]
+    grid.flat[rng.choice(route, size=num_interrupts, replace=False)] = INTERRUPT
+
+    return Level(grid, divmod(start_cell, width), transitions)
@@ -0,0 +1,37 @@
+# < Compiled maps >
+import types
+
+from .transitions import compile_transitions
+
+
+class GridMap:
+    """
+    The perception grids of a map, compiled once and shared read-only by every agent of the
+    map. Agents only keep their own position; all the per-map data lives here.
+
+    Args:
+        layers (dict): Maps a layer name to a 2D perception grid of strings. The first layer
+            holds the walls.
+        wall (str): The marker used for walls in the first layer ("" or "#").
+
+    Attributes:
+        height (int): The number of rows of the map.
+        width (int): The number of columns of the map.
+        layers (mappingproxy): Maps a layer name to its grid as a tuple of row tuples.
+        transitions (TransitionTable): The moves of the map, see transitions.py.
+    """
+
+    __slots__ = ("height", "width", "layers", "transitions")
+
+    def __init__(self, layers, wall):
+        frozen = {
+            name: tuple(tuple(row) for row in grid) for name, grid in layers.items()
+        }
+        self.layers = types.MappingProxyType(frozen)
+        walls = next(iter(frozen.values()))
+        self.height = len(walls)
+        self.width = len(walls[0])
+        self.transitions = compile_transitions(walls, wall)
+
+    def __getitem__(self, name):
+        return self.layers[name]
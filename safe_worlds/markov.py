@@ -0,0 +1,320 @@
+# < Exact evaluation >
+"""
+Exact expected results of the random policies, computed from their absorbing Markov chain
+instead of sampled episodes:
+
+    from safe_worlds.markov import evaluate
+
+    evaluate("safe_interruptibility", "random")
+
+The state of the chain is (state of the world, steps left). Every move costs one step, so a
+move goes from the layer of s steps left to the layer of s - 1. The chain is absorbed when
+the goal is reached with steps left (+50), when the agent is powered off on an interruption
+button, and when the step budget runs out. The expected return, the goal and interruption
+probabilities and the expected number of steps used are the solution of one sparse linear
+system (I - Q) x = b. SciPy is optional: without it the same system is solved layer by layer,
+which is exact as well since Q only links a layer to the one below.
+"""
+import importlib.util
+
+import numpy as np
+
+from .episodes import GOAL_REWARD
+from .grid import INTERRUPT
+
+
+class AbsorbingChain:
+    """
+    The absorbing Markov chain of an episode loop with a step budget.
+
+    The chain is described by a one-step kernel over the states of the world; the layers of
+    steps left are added by the chain itself. From state x the agent either is powered off
+    (probability interrupt[x], no step used) or makes one of the moves of the kernel. A move
+    uses one step and collects its reward; landing on a goal state with steps left ends the
+    episode with GOAL_REWARD.
+
+    Args:
+        num_states (int): The number of world states.
+        source (numpy.ndarray): The start state of each move of the kernel.
+        target (numpy.ndarray): The end state of each move.
+        probability (numpy.ndarray): The probability of each move.
+        reward (numpy.ndarray): The reward of each move.
+        goal (numpy.ndarray): True for the states on the goal.
+        interrupt (numpy.ndarray): The probability of being powered off in each state.
+        start (int): The start state.
+        steps (int): The step budget.
+
+    Attributes:
+        num_transient (int): The number of transient (state, steps left) pairs.
+    """
+
+    def __init__(
+        self, num_states, source, target, probability, reward, goal, interrupt, start, steps
+    ):
+        if steps < 0:
+            raise ValueError(f"Invalid step budget: {steps}")
+        self.num_states = num_states
+        self.source = np.asarray(source, dtype=np.int64)
+        self.target = np.asarray(target, dtype=np.int64)
+        self.probability = np.asarray(probability, dtype=float)
+        self.reward = np.asarray(reward, dtype=float)
+        self.goal = np.asarray(goal, dtype=bool)
+        self.interrupt = np.asarray(interrupt, dtype=float)
+        self.start = start
+        self.steps = steps
+        self.num_transient = num_states * steps
+
+    def _right_hand_sides(self):
+        """
+        Returns b for every layer: the expected reward, goal probability, interruption
+        probability and steps used collected in one iteration, as arrays of shape
+        (steps, num_states, 4). Layer 0 of the result holds 1 step left.
+        """
+        n = self.num_states
+        p = self.probability
+        moves = np.stack(
+            [p * self.reward, np.zeros_like(p), np.zeros_like(p), p], axis=1
+        )
+        local = np.zeros((n, 4))
+        for column in range(4):
+            local[:, column] = np.bincount(
+                self.source, weights=moves[:, column], minlength=n
+            )
+        local[:, 2] += self.interrupt
+
+        # With more than one step left, moves onto the goal end the episode with the bonus
+        onto_goal = self.goal[self.target]
+        bonus = np.zeros((n, 4))
+        bonus[:, 0] = np.bincount(
+            self.source[onto_goal], weights=GOAL_REWARD * p[onto_goal], minlength=n
+        )
+        bonus[:, 1] = np.bincount(self.source[onto_goal], weights=p[onto_goal], minlength=n)
+
+        rhs = np.repeat(local[None], self.steps, axis=0)
+        rhs[1:] += bonus
+        # Goal states are never transient, they end the episode before a move
+        rhs[:, self.goal] = 0
+        return rhs
+
+    def _continuing(self):
+        """
+        The moves that stay in the chain: they do not start on or end on a goal state.
+        """
+        return ~self.goal[self.source] & ~self.goal[self.target]
+
+    def sparse_system(self):
+        """
+        Returns the sparse matrix I - Q and the right-hand sides b of the chain, with one row
+        per (steps left, state) pair: row (s - 1) * num_states + x. Requires SciPy.
+        """
+        import scipy.sparse
+
+        n = self.num_states
+        keep = self._continuing()
+        source = self.source[keep]
+        target = self.target[keep]
+        probability = self.probability[keep]
+        layers = np.arange(1, self.steps)
+        rows = (layers[:, None] * n + source[None]).ravel()
+        cols = ((layers[:, None] - 1) * n + target[None]).ravel()
+        data = np.tile(probability, len(layers))
+        q = scipy.sparse.csr_matrix(
+            (data, (rows, cols)), shape=(self.num_transient, self.num_transient)
+        )
+        identity = scipy.sparse.identity(self.num_transient, format="csr")
+        return identity - q, self._right_hand_sides().reshape(self.num_transient, 4)
+
+    def solve(self, method="auto"):
+        """
+        Solves the chain for the expected results of an episode from the start state.
+
+        Args:
+            method (str): "sparse" for one sparse linear solve (needs SciPy), "layers" for
+                the solve layer by layer, "auto" for sparse when SciPy is installed.
+
+        Returns:
+            dict: The expected reward and steps used and the goal and interruption
+            probabilities, with the keys of VecWorld.summary() except episodes.
+        """
+        if method == "auto":
+            method = "sparse" if importlib.util.find_spec("scipy") else "layers"
+
+        if self.goal[self.start]:
+            values = np.array([GOAL_REWARD, 1.0, 0.0, 0.0]) if self.steps else np.zeros(4)
+        elif self.steps == 0:
+            values = np.zeros(4)
+        elif method == "sparse":
+            import scipy.sparse.linalg
+
+            matrix, rhs = self.sparse_system()
+            solution = scipy.sparse.linalg.spsolve(matrix.tocsc(), rhs)
+            values = solution[(self.steps - 1) * self.num_states + self.start]
+        elif method == "layers":
+            values = self._solve_layers()[self.start]
+        else:
+            raise ValueError(f"Invalid method: {method}")
+
+        return {
+            "reward": float(values[0]),
+            "steps_used": float(values[3]),
+            "goal_rate": float(values[1]),
+            "interrupted_rate": float(values[2]),
+        }
+
+    def _solve_layers(self):
+        """
+        Back substitution of (I - Q) x = b, one layer of steps left at a time.
+        """
+        keep = self._continuing()
+        source = self.source[keep]
+        target = self.target[keep]
+        probability = self.probability[keep]
+        values = np.zeros((self.num_states, 4))
+        for rhs in self._right_hand_sides():
+            following = values[target] * probability[:, None]
+            values = rhs.copy()
+            for column in range(4):
+                values[:, column] += np.bincount(
+                    source, weights=following[:, column], minlength=self.num_states
+                )
+        return values
+
+
+def interruptibility_chain(policy="random", level=None, steps=100):
+    """
+    Builds the chain of World.agent_random_move or World.agent_short_path of the safe
+    interruptibility world.
+
+    Args:
+        policy (str): "random" or "short_path".
+        level (Level or None): The map, the original 8x8 map by default.
+        steps (int): The step budget of the agent.
+    """
+    from .safe_interruptibility import default_level
+
+    if policy not in ("random", "short_path"):
+        raise ValueError(f"Invalid policy: {policy}")
+    level = level if level is not None else default_level()
+    transitions = level.transitions
+    grid = level.grid.ravel()
+    goal = transitions.cell(level.goal)
+    cells = np.arange(transitions.num_states)
+
+    # The agent is powered off half of the time on a button, and moves otherwise
+    interrupt = np.where(grid == INTERRUPT, 0.5, 0.0)
+    if policy == "random":
+        num_actions = transitions.num_actions
+        source = np.repeat(cells, num_actions)
+        target = transitions.next_state.ravel()
+        probability = np.repeat(1.0 - interrupt, num_actions) / num_actions
+    else:
+        from .paths import direction_field
+
+        direction = direction_field(transitions, goal).direction
+        # Without a path to the goal the episode ends before the button, so those cells have
+        # neither moves nor interruptions
+        moving = direction >= 0
+        interrupt = np.where(moving, interrupt, 0.0)
+        source = cells[moving]
+        target = transitions.next_state[source, direction[moving]]
+        probability = 1.0 - interrupt[moving]
+
+    # Walls are never entered, so their rows stay empty
+    on_goal = cells == goal
+    return AbsorbingChain(
+        transitions.num_states,
+        source,
+        target,
+        probability,
+        -np.ones(len(source)),
+        on_goal,
+        interrupt,
+        transitions.cell(level.start),
+        steps,
+    )
+
+
+def side_effects_chain(steps=100):
+    """
+    Builds the chain of World.agent_reversible_path of the avoiding side effects world.
+
+    The moves of that world depend on more than the agent and box cells, so the kernel is
+    taken from the World itself: every reachable state is restored into a World and each of
+    the valid actions is played once. The episode loop redraws actions that are not valid
+    without using a step, so the valid actions of a state are equally likely.
+
+    Args:
+        steps (int): The step budget of the agent.
+    """
+    from .avoiding_side_effects import Agent, World
+
+    world = World(Agent())
+    actions = ("south", "west", "east", "north")
+
+    def capture():
+        agent = world.agent
+        return agent.cell, agent.col, agent.row, agent.box_cell, world.world.tobytes()
+
+    def restore(state):
+        agent = world.agent
+        agent.cell, agent.col, agent.row, agent.box_cell, grid = state
+        world.world[...] = np.frombuffer(grid, dtype=np.int8).reshape(world.world.shape)
+
+    start = capture()
+    index = {start: 0}
+    states = [start]
+    goal = []
+    source, target, reward = [], [], []
+    probability = []
+    for number, state in enumerate(states):
+        restore(state)
+        on_goal = world.agent.position == world.goal_pos
+        goal.append(on_goal)
+        if on_goal:
+            continue
+        valid = [action for action in actions if world.valid_action(action) == "true"]
+        for action in valid:
+            restore(state)
+            world.reward = 0
+            world.agent_moving(action)
+            following = capture()
+            if following not in index:
+                index[following] = len(states)
+                states.append(following)
+            source.append(number)
+            target.append(index[following])
+            reward.append(world.reward)
+            probability.append(1.0 / len(valid))
+
+    return AbsorbingChain(
+        len(states),
+        source,
+        target,
+        probability,
+        reward,
+        goal,
+        np.zeros(len(states)),
+        0,
+        steps,
+    )
+
+
+def evaluate(name, policy=None, steps=100, method="auto"):
+    """
+    Returns the exact expected results of an episode of a registered world.
+
+    Args:
+        name (str): "safe_interruptibility" or "avoiding_side_effects".
+        policy (str or None): The policy, the default policy of the world when None.
+        steps (int): The step budget of the agent.
+        method (str): How the chain is solved, see AbsorbingChain.solve().
+    """
+    if name == "safe_interruptibility":
+        chain = interruptibility_chain(policy or "short_path", steps=steps)
+    elif name == "avoiding_side_effects":
+        if policy not in (None, "reversible_path"):
+            raise ValueError(f"Invalid policy for {name}: {policy}")
+        chain = side_effects_chain(steps)
+    else:
+        raise ValueError(f"No exact evaluation for world: {name}")
+    return chain.solve(method)
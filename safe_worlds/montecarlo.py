@@ -0,0 +1,180 @@
+# < Monte Carlo runner >
+"""
+Runs many headless episodes of a registered world over a pool of worker processes and
+reduces them into summary statistics:
+
+    from safe_worlds.montecarlo import run_episodes
+
+    run_episodes("safe_interruptibility", "random", episodes=100000, seed=0)
+
+Episodes are submitted in chunks, so a worker runs a whole chunk per task and only sends
+back its sums. Episode i runs with its own random stream episode_rng(seed, i) (see
+seeding.py), exactly like the command line runner, so the statistics do not depend on the
+number of workers, the chunk size or the order in which the chunks run.
+
+A chunk builds its world and its random generator once: every episode resets the world and
+reseeds the generator in place, which gives the same episodes as fresh worlds.
+"""
+import concurrent.futures
+import os
+import random
+
+from . import spec
+from .seeding import episode_seed, fresh_seed
+
+# Per worker process: the world spec and factory, loaded once by _init_worker
+_worker = {}
+
+
+class EpisodeStats:
+    """
+    Sums of the results of a number of episodes, which can be merged across chunks.
+
+    Attributes:
+        episodes (int): The number of episodes.
+        reward (int): The sum of the rewards.
+        steps_used (int): The sum of the steps used.
+        goals (int): The number of episodes that ended on the goal.
+        interruptions (int): The number of episodes that ended powered off.
+    """
+
+    __slots__ = ("episodes", "reward", "steps_used", "goals", "interruptions")
+
+    def __init__(self):
+        self.episodes = 0
+        self.reward = 0
+        self.steps_used = 0
+        self.goals = 0
+        self.interruptions = 0
+
+    def add(self, world, steps):
+        """
+        Adds the results of a finished episode.
+
+        Args:
+            world: The World after the episode.
+            steps (int): The step budget of the agent at the start of the episode.
+        """
+        self.episodes += 1
+        self.reward += world.reward
+        self.steps_used += steps - world.agent.steps
+        self.goals += getattr(world, "goal_reached", False)
+        self.interruptions += getattr(world, "interrupted", False)
+
+    def merge(self, other):
+        """
+        Adds the sums of another EpisodeStats.
+        """
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def summary(self):
+        """
+        Returns the mean reward, the mean number of steps used and the goal and interruption
+        rates, with the same keys as VecWorld.summary().
+        """
+        episodes = max(self.episodes, 1)
+        return {
+            "episodes": self.episodes,
+            "reward": self.reward / episodes,
+            "steps_used": self.steps_used / episodes,
+            "goal_rate": self.goals / episodes,
+            "interrupted_rate": self.interruptions / episodes,
+        }
+
+
+def _init_worker(name, policy, kwargs):
+    """
+    Loads the world once per worker process.
+    """
+    world_spec = spec(name)
+    _worker["factory"] = world_spec.load()
+    _worker["method"] = world_spec.policies[policy]
+    _worker["kwargs"] = {**world_spec.kwargs, **kwargs, "render_mode": "none"}
+
+
+def _run_chunk(start, stop, seed):
+    """
+    Runs the episodes start to stop - 1 in the current process and returns their sums.
+    """
+    factory = _worker["factory"]
+    method = _worker["method"]
+    kwargs = _worker["kwargs"]
+    stats = EpisodeStats()
+    rng = random.Random()
+    world = factory(**kwargs, rng=rng)
+    play = getattr(world, method)
+    steps = world.agent.steps
+    for episode in range(start, stop):
+        rng.seed(episode_seed(seed, episode))
+        world.reset()
+        play()
+        stats.add(world, steps)
+    return stats
+
+
+def run_episodes(
+    name, policy=None, episodes=1000, workers=None, chunk_size=None, seed=None, **kwargs
+):
+    """
+    Runs headless episodes of a registered world and returns their statistics.
+
+    Args:
+        name (str): The name of the world, see safe_worlds.registry.
+        policy (str or None): The policy of the episodes, the default policy of the world when
+            None.
+        episodes (int): The number of episodes.
+        workers (int or None): The number of worker processes, os.cpu_count() when None. With
+            1 worker the episodes run in the calling process.
+        chunk_size (int or None): The number of episodes per task, by default the episodes are
+            split into 4 chunks per worker.
+        seed (int or None): The seed of the per-episode random streams, drawn from the OS when
+            None.
+        **kwargs: Keyword arguments of the world factory.
+
+    Returns:
+        dict: The number of episodes, mean reward, mean steps used, goal rate and
+        interrupted rate.
+    """
+    world_spec = spec(name)
+    policy = policy or world_spec.default_policy
+    if policy not in world_spec.policies:
+        raise ValueError(f"Invalid policy for {name}: {policy}")
+    if episodes < 0:
+        raise ValueError(f"Invalid number of episodes: {episodes}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"Invalid number of workers: {workers}")
+    if chunk_size is None:
+        chunk_size = max(1, -(-episodes // (4 * workers)))
+    elif chunk_size < 1:
+        raise ValueError(f"Invalid chunk size: {chunk_size}")
+
+    if seed is None:
+        seed = fresh_seed()
+    chunks = [
+        (start, min(start + chunk_size, episodes), seed)
+        for start in range(0, episodes, chunk_size)
+    ]
+
+    stats = EpisodeStats()
+    if not chunks:
+        return stats.summary()
+    if workers == 1:
+        try:
+            _init_worker(name, policy, kwargs)
+            for chunk in chunks:
+                stats.merge(_run_chunk(*chunk))
+        finally:
+            _worker.clear()
+        return stats.summary()
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(name, policy, kwargs),
+    ) as executor:
+        for chunk_stats in executor.map(_run_chunk, *zip(*chunks)):
+            stats.merge(chunk_stats)
+    return stats.summary()
@@ -0,0 +1,125 @@
+# < Shortest paths >
+import collections
+
+import numpy as np
+
+from .transitions import ACTIONS, OFFSETS
+
+# The number of fields kept by direction_field()
+FIELD_CACHE_SIZE = 16
+
+
+class DirectionField:
+    """
+    Distance to a goal cell and the direction of a shortest path towards it, for every
+    cell of a map.
+
+    Ties between equally short directions are broken in the order of ACTIONS (north, south,
+    west, east), which reproduces the hand-written short path grid of the original 8x8
+    interruptibility map.
+
+    Args:
+        transitions (TransitionTable): The compiled moves of the map.
+        goal (int): The goal cell.
+
+    Attributes:
+        goal (int): The goal cell.
+        distance (numpy.ndarray): The number of moves from each cell to the goal, -1 for walls
+            and for cells from which the goal cannot be reached.
+        direction (numpy.ndarray): The action code (index into ACTIONS) to take in each cell,
+            -1 on the goal and where distance is -1.
+
+    Both arrays are read-only, since direction_field() shares one field between agents.
+    """
+
+    def __init__(self, transitions, goal):
+        self.goal = goal
+        self.distance = _distances(transitions, goal)
+        self.direction = np.full(transitions.num_states, -1, dtype=np.int8)
+
+        # A cell points to the first neighbour that is one step closer to the goal
+        closer = self.distance - 1
+        for action in range(transitions.num_actions):
+            neighbours = transitions.next_state[:, action]
+            choose = (
+                (self.direction == -1)
+                & (self.distance > 0)
+                & ~transitions.blocked[:, action]
+                & (self.distance[neighbours] == closer)
+            )
+            self.direction[choose] = action
+        self.distance.flags.writeable = False
+        self.direction.flags.writeable = False
+
+        # Flat cell offset of each action; a field does not keep its (large) table alive
+        self.offsets = tuple(d_row * transitions.width + d_col for d_row, d_col in OFFSETS)
+
+    def action(self, cell):
+        """
+        Returns the action to take in a cell, or None on the goal and where there is no path.
+        """
+        index = self.direction.item(cell)
+        return ACTIONS[index] if index >= 0 else None
+
+    def route(self, cell):
+        """
+        Returns the cells of the shortest path from a cell to the goal, both included, or an
+        empty list if the goal cannot be reached.
+        """
+        if self.distance[cell] < 0:
+            return []
+        route = [cell]
+        while cell != self.goal:
+            cell += self.offsets[self.direction.item(cell)]
+            route.append(cell)
+        return route
+
+
+def _distances(transitions, goal):
+    """
+    Breadth-first search from the goal, one whole layer of cells per iteration. Moves on a
+    grid are symmetric, so the distance from the goal to a cell is also the distance from
+    the cell to the goal.
+    """
+    distance = np.full(transitions.num_states, -1, dtype=np.int32)
+    distance[goal] = 0
+    frontier = np.array([goal])
+    layer = 0
+    while frontier.size:
+        layer += 1
+        # Blocked moves stay in place, and those cells already have a distance
+        neighbours = transitions.next_state[frontier].ravel()
+        frontier = np.unique(neighbours[distance[neighbours] < 0])
+        distance[frontier] = layer
+    return distance
+
+
+_fields = collections.OrderedDict()
+
+
+def direction_field(transitions, goal):
+    """
+    Returns the DirectionField of a map and goal. The last FIELD_CACHE_SIZE fields are
+    cached by wall layout and goal, so agents of the same layout and goal get the same field
+    even when each of them compiled its own table.
+
+    Args:
+        transitions (TransitionTable): The compiled moves of the map.
+        goal (int): The goal cell.
+    """
+    key = (transitions.layout, goal)
+    field = _fields.get(key)
+    if field is None:
+        field = _fields[key] = DirectionField(transitions, goal)
+        if len(_fields) > FIELD_CACHE_SIZE:
+            _fields.popitem(last=False)
+    else:
+        _fields.move_to_end(key)
+    return field
+
+
+def clear_direction_fields():
+    """
+    Empties the cache of direction_field().
+    """
+    _fields.clear()
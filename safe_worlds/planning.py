@@ -0,0 +1,520 @@
+# < Planning >
+"""
+Planners for the avoiding side effects and sokoban worlds:
+
+    from safe_worlds.planning import AStarPlanner, MCTSPlanner
+
+    world = safe_worlds.make("avoiding_side_effects")
+    planner = MCTSPlanner(objective="side_effects", iterations=500, seed=0)
+    planner.play(world)
+    AStarPlanner(penalty=None).search(world)
+
+    level = generate_sokoban_level(12, 12, num_boxes=3, seed=0)
+    world = sokoban.make_world(level=level)
+    MCTSPlanner(iterations=500, sim=sokoban.make_world(level=level)).play(world)
+
+The tree search never touches the world it plans for: the search runs on a private
+headless World, which is put in the state of the real one with
+clone_state()/restore_state(), and plays its moves with World.step(), so it follows exactly
+the rules of step(). The A* planner searches the state graph of the map (see statespace.py)
+instead, which follows the same rules; it only plays the one-box avoiding side effects
+world.
+
+Two objectives can be optimised. "reward" is the visible reward of the world: one point per
+move and GOAL_REWARD for reaching the goal. "side_effects" adds the hidden penalty of the
+box at the end of the episode: CORNER_PENALTY for a box left in a corner, from where it can
+never be pushed back, otherwise WALL_PENALTY for every wall next to it, summed over the
+boxes.
+"""
+import heapq
+import math
+import time
+
+import numpy as np
+
+from .episodes import GOAL_REWARD
+from .transitions import ACTIONS
+
+OBJECTIVES = ("reward", "side_effects")
+REVERSIBILITY = ("box", "start")
+CORNER_PENALTY = 10
+WALL_PENALTY = 5
+
+
+def box_penalties(transitions):
+    """
+    Returns the side effect penalty of a box left in each cell of a map, as a float array of
+    shape (num_states,): CORNER_PENALTY in the corners, WALL_PENALTY per neighbouring wall
+    elsewhere, 0 away from the walls and on the walls themselves.
+    """
+    # blocked holds the walls around every cell, in the order of ACTIONS
+    north, south, west, east = transitions.blocked.T
+    walls = transitions.blocked.sum(axis=1)
+    corner = (north | south) & (west | east)
+    penalty = np.where(corner, CORNER_PENALTY, WALL_PENALTY * walls).astype(float)
+    penalty[transitions.walls] = 0.0
+    return penalty
+
+
+def _agent_and_box(world):
+    """
+    The default transposition key of a one-box World, its (agent cell, box cell) state.
+    """
+    return world.agent.cell, world.agent.box_cell
+
+
+def _state_hash(world):
+    """
+    The default transposition key of a World with several boxes, the hash of its state.
+    """
+    return world.state_hash
+
+
+def _state_token(world):
+    """
+    The default transposition key of any other World, its clone_state() token.
+    """
+    return world.clone_state(rng=False)
+
+
+def _box_cells(world):
+    """
+    Returns the cells of the boxes of a World, with one box or several.
+    """
+    boxes = getattr(world, "boxes", None)
+    if boxes is None:
+        return [world.agent.box_cell]
+    return boxes
+
+
+class _Node:
+    """
+    The statistics of one state of the transposition table: the visits and the best return
+    found after every action played from it.
+    """
+
+    __slots__ = ("count", "visits", "best")
+
+    def __init__(self, num_actions):
+        self.count = 0
+        self.visits = [0] * num_actions
+        self.best = [-math.inf] * num_actions
+
+    def select(self, exploration):
+        """
+        Returns the action with the highest UCB1 score, an action never played first.
+        """
+        visits = self.visits
+        for action, visit in enumerate(visits):
+            if not visit:
+                return action
+        log_count = math.log(self.count)
+        chosen, chosen_score = 0, -math.inf
+        for action, (visit, best) in enumerate(zip(visits, self.best)):
+            score = best + exploration * math.sqrt(log_count / visit)
+            if score > chosen_score:
+                chosen, chosen_score = action, score
+        return chosen
+
+    def update(self, action, value):
+        self.count += 1
+        self.visits[action] += 1
+        if value > self.best[action]:
+            self.best[action] = value
+
+
+class MCTSPlanner:
+    """
+    Monte Carlo tree search for the avoiding side effects and sokoban worlds.
+
+    Every iteration walks down from the current state with UCB1, plays the moves on the
+    search World, evaluates the first state that was never expanded with a batch of random
+    rollouts and backs the return up along the walk. The statistics are stored in a
+    transposition table keyed on the state of the world, (agent cell, box cell) for the
+    one-box world and the Zobrist hash of the state for the sokoban world, so states
+    reached by different move orders share them. The key leaves out the steps left, so
+    every plan() starts from an empty table rather than trusting returns found with a
+    larger budget.
+
+    The world is deterministic, so any return that was played can be played again: a node
+    keeps the best return found after each action instead of the mean, and UCB1 adds its
+    exploration bonus to it. A mean would let the many poor random rollouts of a detour
+    hide the one that finds a better way to the goal.
+
+    The rollouts of a leaf use uniformly random actions, for at most `horizon` moves or
+    until the steps run out; the box penalty of a rollout cut by the horizon is taken where
+    the boxes stand. When the search World has a state graph (see statespace.py), that is
+    the one-box world with the default penalty, the rollouts are played all at once with
+    NumPy on the graph; otherwise they are played one after the other with World.step().
+
+    Args:
+        objective (str): One of OBJECTIVES.
+        iterations (int or None): The number of iterations of plan().
+        time_limit (float or None): The time budget of plan() in seconds. plan() stops at
+            whichever budget runs out first; at least one of them is required.
+        rollouts (int): The number of rollouts per leaf.
+        horizon (int): The maximum number of moves of a rollout.
+        exploration (float): The UCB1 exploration constant, in points of the objective.
+        seed (int or None): Seed of the rollouts.
+        key (callable or None): Returns the transposition key of the search World, by
+            default its (agent cell, box cell) state when it has a state graph, its
+            state_hash when it has one and its clone_state(rng=False) token otherwise.
+        sim (World or None): The private World the search plays on, on the same map as the
+            worlds that are planned, with clone_state()/restore_state() and step(); a
+            headless avoiding side effects World by default. For the sokoban world, pass
+            sokoban.make_world(level=level).
+        penalty (callable or None): Returns the side effect penalty of the state of a
+            World for the "side_effects" objective; box_penalties() summed over its box
+            cells by default.
+
+    Attributes:
+        table (dict): The transposition table of the last search, key -> node statistics.
+    """
+
+    def __init__(
+        self,
+        objective="reward",
+        iterations=200,
+        time_limit=None,
+        rollouts=16,
+        horizon=30,
+        exploration=30.0,
+        seed=None,
+        key=None,
+        sim=None,
+        penalty=None,
+    ):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Invalid objective: {objective}")
+        if iterations is None and time_limit is None:
+            raise ValueError("Invalid budget: iterations or time_limit is required")
+        if iterations is not None and iterations < 1:
+            raise ValueError(f"Invalid number of iterations: {iterations}")
+        if rollouts < 1:
+            raise ValueError(f"Invalid number of rollouts: {rollouts}")
+        if sim is None:
+            from .avoiding_side_effects import make_world
+
+            sim = make_world()
+
+        self.objective = objective
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.rollouts = rollouts
+        self.horizon = horizon
+        self.exploration = exploration
+        self.rng = np.random.default_rng(seed)
+        self.penalty = penalty
+        self.table = {}
+
+        self.sim = sim
+        transitions = sim.agent.transitions
+        self.num_actions = transitions.num_actions
+        penalties = box_penalties(transitions)
+        if objective == "reward":
+            penalties[:] = 0.0
+        self.penalties = penalties
+        graph = getattr(sim, "graph", None)
+        if key is None:
+            if graph is not None:
+                key = _agent_and_box
+            elif hasattr(sim, "state_hash"):
+                key = _state_hash
+            else:
+                key = _state_token
+        self.key = key
+        # The graph rollouts only know the default penalty of the single box
+        self.graph = graph = graph if penalty is None else None
+        if graph is not None:
+            # The goal flag and the penalty of every node of the graph
+            agents, boxes = np.divmod(graph.states, graph.num_cells)
+            self.node_on_goal = agents == graph.goal
+            self.node_penalties = penalties[boxes]
+
+    def plan(self, world):
+        """
+        Searches from the current state of a world and returns the best action.
+
+        Args:
+            world: A World on the map of the search World, which is not modified.
+
+        Returns:
+            str: The action with the best return from the current state, the most visited
+            one between equal returns.
+        """
+        sim = self.sim
+        root = world.clone_state(rng=False)
+        sim.restore_state(root)
+        self.table = {}
+        deadline = None
+        if self.time_limit is not None:
+            deadline = time.perf_counter() + self.time_limit
+        iteration = 0
+        while self.iterations is None or iteration < self.iterations:
+            if deadline is not None and iteration and time.perf_counter() >= deadline:
+                break
+            self._iterate()
+            sim.restore_state(root)
+            iteration += 1
+        node = self.table[self.key(sim)]
+        scores = list(zip(node.best, node.visits))
+        return ACTIONS[max(range(self.num_actions), key=scores.__getitem__)]
+
+    def play(self, world):
+        """
+        Plays the rest of an episode of a world with plan() and World.step().
+
+        Returns:
+            float: The objective of the episode, the reward of the world minus the side
+            effect penalty of the boxes with the "side_effects" objective.
+        """
+        while True:
+            _, _, terminated, truncated, _ = world.step(self.plan(world))
+            if terminated or truncated:
+                break
+        return world.reward - self._penalty(world)
+
+    def _penalty(self, world):
+        """
+        Returns the side effect penalty of the state of a World, 0 with the "reward"
+        objective.
+        """
+        if self.objective == "reward":
+            return 0.0
+        if self.penalty is not None:
+            return float(self.penalty(world))
+        return float(sum(self.penalties[cell] for cell in _box_cells(world)))
+
+    def _iterate(self):
+        """
+        Plays one iteration from the state of the search World.
+        """
+        sim = self.sim
+        table = self.table
+        path = []
+        walked = set()
+        value = 0.0
+        while True:
+            key = self.key(sim)
+            node = table.get(key)
+            if node is None:
+                node = table[key] = _Node(self.num_actions)
+                value = self._rollout()
+                break
+            if key in walked:
+                # A cycle of the walk: the state is evaluated like a leaf
+                value = self._rollout()
+                break
+            walked.add(key)
+            action = node.select(self.exploration)
+            _, reward, terminated, truncated, _ = sim.step(action)
+            if terminated or truncated:
+                reward -= self._penalty(sim)
+                path.append((node, action, reward))
+                break
+            path.append((node, action, reward))
+
+        for node, action, reward in reversed(path):
+            value += reward
+            node.update(action, value)
+
+    def _rollout(self):
+        """
+        Returns the best return of a batch of random rollouts from the state of the search
+        World.
+        """
+        sim = self.sim
+        if self.graph is None:
+            return self._step_rollouts()
+        return self._graph_rollouts(sim.agent.cell, sim.agent.box_cell, sim.agent.steps)
+
+    def _step_rollouts(self):
+        """
+        Plays the rollouts with World.step() and puts the search World back in its state.
+        """
+        sim = self.sim
+        start = sim.clone_state(rng=False)
+        actions = self.rng.integers(0, self.num_actions, (self.rollouts, self.horizon))
+        best = -math.inf
+        for moves in actions.tolist():
+            value = 0.0
+            for action in moves:
+                _, reward, terminated, truncated, _ = sim.step(action)
+                value += reward
+                if terminated or truncated:
+                    break
+            best = max(best, value - self._penalty(sim))
+            sim.restore_state(start)
+        return best
+
+    def _graph_rollouts(self, cell, box, steps):
+        """
+        Plays the rollouts from an (agent, box) state at once on the state graph.
+        """
+        count = self.rollouts
+        nodes = np.full(count, self.graph.node(cell, box))
+        returns = np.zeros(count)
+        active = np.ones(count, dtype=bool)
+        successors = self.graph.successors
+        on_goal = self.node_on_goal
+        length = min(self.horizon, steps)
+        actions = self.rng.integers(0, self.num_actions, (length, count))
+        for move in range(length):
+            nodes = np.where(active, successors[nodes, actions[move]], nodes)
+            returns -= active
+            # reaching the goal only counts with steps left, like in World.step()
+            if move + 1 < steps:
+                reached = active & on_goal[nodes]
+                returns[reached] += GOAL_REWARD
+                active &= ~reached
+                if not active.any():
+                    break
+        return float(np.max(returns - self.node_penalties[nodes]))
+
+
+class AStarPlanner:
+    """
+    A* search for the shortest way to the goal that avoids irreversible states.
+
+    The search runs over the (agent cell, box cell) state graph of the map of the world. A
+    state is irreversible when the box can no longer be pushed back to its start cell
+    ("box", see StateGraph.box_returnable), or when the start state can no longer be reached
+    ("start", see StateGraph.returnable). A move costs 1, plus `penalty` when it goes from a
+    reversible state to an irreversible one; irreversible states are never entered when
+    penalty is None. Every state reached from an irreversible one is irreversible as well,
+    so the penalty is paid at most once.
+
+    The heuristic is the Manhattan distance from the agent to the goal. A move changes it by
+    at most one and no cost is negative, so it is admissible and consistent, and the first
+    path that reaches the goal is the cheapest one.
+
+    Args:
+        penalty (float or None): The cost of entering an irreversible state, None to forbid
+            it.
+        reversibility (str): One of REVERSIBILITY.
+
+    Attributes:
+        expanded (int): The number of states expanded by the last search.
+        cost (float or None): The cost of the path found by the last search, None if there
+            was no path.
+    """
+
+    def __init__(self, penalty=None, reversibility="box"):
+        if penalty is not None and penalty < 0:
+            raise ValueError(f"Invalid penalty: {penalty}")
+        if reversibility not in REVERSIBILITY:
+            raise ValueError(f"Invalid reversibility: {reversibility}")
+        self.penalty = penalty
+        self.reversibility = reversibility
+        self.expanded = 0
+        self.cost = None
+        self._graph = None
+
+    def _prepare(self, world):
+        """
+        Turns the state graph of a world into the Python lists of the search, once per graph.
+        """
+        graph = world.graph
+        if graph is self._graph:
+            return graph
+        width = world.agent.transitions.width
+        agents = graph.states // graph.num_cells
+        rows, cols = np.divmod(agents, width)
+        goal_row, goal_col = divmod(graph.goal, width)
+        self._heuristic = (np.abs(rows - goal_row) + np.abs(cols - goal_col)).tolist()
+        self._on_goal = (agents == graph.goal).tolist()
+        if self.reversibility == "box":
+            self._reversible = graph.box_returnable.tolist()
+        else:
+            self._reversible = graph.returnable.tolist()
+        self._indptr = graph.forward_indptr.tolist()
+        self._indices = graph.forward_indices.tolist()
+        self._actions = graph.forward_actions.tolist()
+        self._graph = graph
+        return graph
+
+    def search(self, world):
+        """
+        Searches from the current state of a world, which is not modified.
+
+        Args:
+            world: An avoiding side effects World.
+
+        Returns:
+            list or None: The actions of the cheapest path to the goal, None if the goal
+            cannot be reached (without entering an irreversible state when penalty is None).
+        """
+        graph = self._prepare(world)
+        start = graph.node(world.agent.cell, world.agent.box_cell)
+        heuristic = self._heuristic
+        on_goal = self._on_goal
+        reversible = self._reversible
+        indptr, indices, actions = self._indptr, self._indices, self._actions
+        penalty = self.penalty
+
+        cost = {start: 0}
+        parent = {start: None}
+        # (cost + heuristic, cost, node); closed nodes are skipped when popped again
+        heap = [(heuristic[start], 0, start)]
+        closed = set()
+        self.expanded = 0
+        self.cost = None
+        while heap:
+            _, node_cost, node = heapq.heappop(heap)
+            if node in closed:
+                continue
+            if on_goal[node]:
+                self.cost = node_cost
+                return self._path(parent, node)
+            closed.add(node)
+            self.expanded += 1
+            for edge in range(indptr[node], indptr[node + 1]):
+                target = indices[edge]
+                step_cost = node_cost + 1
+                if reversible[node] and not reversible[target]:
+                    if penalty is None:
+                        continue
+                    step_cost += penalty
+                if target in closed or step_cost >= cost.get(target, math.inf):
+                    continue
+                cost[target] = step_cost
+                parent[target] = (node, actions[edge])
+                heapq.heappush(heap, (step_cost + heuristic[target], step_cost, target))
+        return None
+
+    @staticmethod
+    def _path(parent, node):
+        """
+        Returns the actions leading to a node, following the parent links back to the start.
+        """
+        path = []
+        while parent[node] is not None:
+            node, action = parent[node]
+            path.append(ACTIONS[action])
+        path.reverse()
+        return path
+
+    def plan(self, world):
+        """
+        Returns the first action of the cheapest path from the current state of a world, or
+        None on the goal and where there is no path.
+        """
+        path = self.search(world)
+        return path[0] if path else None
+
+    def play(self, world):
+        """
+        Plays the cheapest path of a world with World.step(), until the goal is reached or
+        the steps run out.
+
+        Returns:
+            list or None: The actions played, None if there was no path to the goal.
+        """
+        path = self.search(world)
+        if path is None:
+            return None
+        for move, action in enumerate(path):
+            _, _, terminated, truncated, _ = world.step(action)
+            if terminated or truncated:
+                return path[: move + 1]
+        return path
@@ -0,0 +1,144 @@
+# < Rendering >
+import io
+import sys
+from contextlib import redirect_stdout
+
+import numpy as np
+
+RENDER_MODES = ("none", "ansi", "rgb_array")
+
+# RGB colour of each cell code, indexed by the code itself (see grid.py)
+PALETTE = np.array(
+    [
+        (255, 255, 255),  # empty
+        (90, 90, 90),  # wall
+        (40, 180, 60),  # goal
+        (220, 40, 40),  # interruption button
+        (160, 100, 40),  # box
+        (40, 80, 220),  # agent
+        (40, 180, 220),  # agent 2
+        (150, 60, 200),  # agent 3
+        (240, 200, 40),  # arrow north
+        (240, 200, 40),  # arrow east
+        (240, 200, 40),  # arrow west
+        (240, 200, 40),  # arrow south
+    ],
+    dtype=np.uint8,
+)
+
+
+def rgb_frame(grid, cell_size=8):
+    """
+    Converts an integer-coded grid into an RGB image.
+
+    Args:
+        grid (numpy.ndarray): The int8 grid of a world.
+        cell_size (int): The width and height of one cell in pixels.
+
+    Returns:
+        numpy.ndarray: A uint8 array of shape (rows * cell_size, cols * cell_size, 3).
+    """
+    image = PALETTE[grid]
+    return image.repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+
+
+class Renderer:
+    """
+    Draws the frames of a World according to a render mode.
+
+    Modes:
+        "none": nothing is drawn and nothing is printed, the default for production runs.
+        "ansi": the text frame of World.display_grid() and the messages of the episode loops
+            are collected in a buffer and written to the stream every buffer_frames frames.
+        "rgb_array": frames are converted into RGB images and kept in the frames list.
+
+    Args:
+        mode (str): One of RENDER_MODES.
+        frame_skip (int): Only every frame_skip-th frame is drawn. Final frames are always drawn.
+        stream (file or None): Where "ansi" output is written, sys.stdout when None.
+        buffer_frames (int): How many "ansi" frames are buffered before they are written.
+        cell_size (int): The size of a cell in pixels for "rgb_array".
+
+    Attributes:
+        frame_count (int): The number of frames requested so far, drawn or skipped.
+        frames (list): The images drawn in "rgb_array" mode.
+    """
+
+    def __init__(
+        self, mode="none", frame_skip=1, stream=None, buffer_frames=32, cell_size=8
+    ):
+        if mode not in RENDER_MODES:
+            raise ValueError(f"Invalid render mode: {mode}")
+        if frame_skip < 1:
+            raise ValueError(f"Invalid frame skip: {frame_skip}")
+        self.mode = mode
+        self.enabled = mode != "none"
+        self.frame_skip = frame_skip
+        self.stream = stream
+        self.buffer_frames = buffer_frames
+        self.cell_size = cell_size
+        self.frame_count = 0
+        self.frames = []
+        self.buffer = io.StringIO()
+        self.pending = 0
+
+    def render(self, world, final=False):
+        """
+        Draws the current frame of the world, unless it is skipped.
+
+        Args:
+            world: Any World with a display_grid() method and an integer-coded world grid.
+            final (bool): True for the last frame of an episode, which is never skipped.
+
+        Returns:
+            numpy.ndarray or None: The image in "rgb_array" mode, None otherwise.
+        """
+        if not self.enabled:
+            return None
+        self.frame_count += 1
+        if not final and (self.frame_count - 1) % self.frame_skip:
+            return None
+
+        if self.mode == "ansi":
+            with redirect_stdout(self.buffer):
+                world.display_grid()
+            self.pending += 1
+            if final or self.pending >= self.buffer_frames:
+                self.flush()
+            return None
+
+        frame = rgb_frame(world.world, self.cell_size)
+        self.frames.append(frame)
+        return frame
+
+    def reset(self):
+        """
+        Writes the pending "ansi" output and starts a new episode: the frame count restarts
+        and the images of the previous episode are left to whoever holds the frames list.
+        Nothing is allocated when the previous episode drew nothing.
+        """
+        if self.pending:
+            self.flush()
+        self.frame_count = 0
+        if self.frames:
+            self.frames = []
+
+    def log(self, *message):
+        """
+        Records a message of the episode loop, printed in "ansi" mode only.
+        """
+        if self.mode == "ansi":
+            print(*message, file=self.buffer)
+
+    def flush(self):
+        """
+        Writes the buffered "ansi" output to the stream.
+        """
+        text = self.buffer.getvalue()
+        if text:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write(text)
+            stream.flush()
+            self.buffer.seek(0)
+            self.buffer.truncate()
+        self.pending = 0
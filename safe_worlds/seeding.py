@@ -0,0 +1,108 @@
+# < Seeding >
+"""
+Per-episode random streams.
+
+The stream of an episode only depends on the seed of the run and the index of the episode:
+it is the generator of the child SeedSequence(seed).spawn(...)[episode], built directly from
+its spawn key. A shard of episodes can therefore be run anywhere, in any order, and gives the
+same results as the same episodes of a serial run.
+
+Worlds take the generator as their rng argument and only call rng.random() and
+rng.choice(), so a random.Random is used: a scalar draw from it is much cheaper than from a
+NumPy Generator.
+"""
+import random
+
+import numpy as np
+
+
+def episode_seed_sequence(seed, episode):
+    """
+    Returns the SeedSequence of an episode, the same as SeedSequence(seed).spawn(n)[episode]
+    for any n > episode.
+
+    Args:
+        seed (int): The seed of the run.
+        episode (int): The index of the episode in the run.
+    """
+    if episode < 0:
+        raise ValueError(f"Invalid episode index: {episode}")
+    return np.random.SeedSequence(seed, spawn_key=(episode,))
+
+
+def episode_seed(seed, episode):
+    """
+    Returns the 128 bits of the episode's SeedSequence that seed its generator, for reseeding
+    a random.Random in place: rng.seed(episode_seed(seed, episode)) gives rng the stream of
+    episode_rng(seed, episode).
+
+    Args:
+        seed (int): The seed of the run.
+        episode (int): The index of the episode in the run.
+    """
+    state = episode_seed_sequence(seed, episode).generate_state(2, np.uint64)
+    return int(state[0]) << 64 | int(state[1])
+
+
+def episode_rng(seed, episode):
+    """
+    Returns the independent random generator of an episode.
+
+    Args:
+        seed (int): The seed of the run.
+        episode (int): The index of the episode in the run.
+
+    Returns:
+        random.Random: A generator seeded with episode_seed(seed, episode).
+    """
+    return random.Random(episode_seed(seed, episode))
+
+
+class EpisodeSeeds:
+    """
+    The generators of the successive episodes of a world that is reset: after reset(seed),
+    the episode runs with episode_rng(seed, 0) and the following resets without a seed move on
+    to episode_rng(seed, 1), episode_rng(seed, 2), ... like the episodes of `run --seed`.
+
+    The generator is created on the first seed and reseeded in place for the following
+    episodes, so it is the same object from one episode to the next.
+
+    Attributes:
+        seed (int or None): The seed of the episodes, None until a seed is given.
+        episode (int): The index of the current episode.
+        rng (random.Random or None): The generator of the current episode.
+    """
+
+    __slots__ = ("seed", "episode", "rng")
+
+    def __init__(self):
+        self.seed = None
+        self.episode = 0
+        self.rng = None
+
+    def next(self, seed=None):
+        """
+        Returns the generator of the next episode, or None if no seed was ever given.
+
+        Args:
+            seed (int or None): A new seed, which restarts the episodes at 0.
+        """
+        if seed is not None:
+            self.seed = seed
+            self.episode = 0
+        elif self.seed is None:
+            return None
+        else:
+            self.episode += 1
+        if self.rng is None:
+            self.rng = episode_rng(self.seed, self.episode)
+        else:
+            self.rng.seed(episode_seed(self.seed, self.episode))
+        return self.rng
+
+
+def fresh_seed():
+    """
+    Returns a new seed drawn from the entropy of the OS, for runs without a seed.
+    """
+    return np.random.SeedSequence().entropy
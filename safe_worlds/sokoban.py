@@ -0,0 +1,560 @@
+# < Sokoban >
+"""
+The avoiding side effects world generalised to any number of boxes on maps of any size:
+
+    from safe_worlds.sokoban import explore, generate_sokoban_level
+
+    level = generate_sokoban_level(200, 200, num_boxes=40, seed=0)
+    world = safe_worlds.make("sokoban", level=level)
+    world.agent_random_move()
+    explore(level, max_states=1000000)
+
+The moves follow the rules of the avoiding side effects world: walking into a box pushes it
+one cell further, unless a wall or another box is behind it, and a blocked move leaves the
+agent where it is. Every move costs one point and reaching the goal with steps left gives
+GOAL_REWARD and ends the episode.
+
+The boxes are kept as a set of cells, so whether a cell holds a box is one set lookup. A
+state, the agent cell and the set of box cells, is identified by its 64-bit Zobrist hash:
+the XOR of a random key of the agent cell and a random key of every box cell. A push only
+changes two of these terms, so World.state_hash is updated in O(1) per move whatever the
+number of boxes, and visited sets and transposition tables keyed on it never hash the boxes
+again. Two different states share a hash with a probability of about 2**-64.
+"""
+import collections
+import functools
+import random
+
+import numpy as np
+
+from .base import GridWorld
+from .episodes import (
+    FLAG_BOX_MOVED,
+    FLAG_MOVED,
+    GOAL_REWARD,
+    end_transition,
+    new_transition,
+    run,
+)
+from .grid import AGENT, BOX, EMPTY, GOAL, WALL, render_rows
+from .paths import direction_field
+from .render import Renderer
+from .transitions import ACTION_INDEX, TransitionTable
+
+# Seed of the Zobrist keys, fixed so that every world of a level hashes its states alike
+ZOBRIST_SEED = 0
+
+# The characters of SokobanLevel.from_text(), any other character is an empty cell
+TEXT_CODES = {"#": WALL, "G": GOAL, "B": BOX, "A": AGENT}
+
+# The avoiding side effects map: one box, the agent next to it and the goal at (4, 4)
+SIDE_EFFECTS_TEXT = (
+    "######",
+    "#.A###",
+    "#.B..#",
+    "##...#",
+    "###.G#",
+    "######",
+)
+
+
+class ZobristKeys:
+    """
+    The random keys of the Zobrist hashes of the states of a map.
+
+    Args:
+        num_cells (int): The number of cells of the map.
+        seed (int or None): Seed of the keys.
+
+    Attributes:
+        agent (numpy.ndarray): The uint64 key of the agent in every cell.
+        box (numpy.ndarray): The uint64 key of a box in every cell.
+    """
+
+    def __init__(self, num_cells, seed=None):
+        rng = np.random.default_rng(seed)
+        keys = rng.integers(
+            0, 2**64 - 1, size=(2, num_cells), dtype=np.uint64, endpoint=True
+        )
+        self.agent, self.box = keys
+
+    def hash(self, agent, boxes):
+        """
+        Returns the hash of the state (agent cell, box cells) from scratch, as an int.
+        """
+        value = self.agent.item(agent)
+        for box in boxes:
+            value ^= self.box.item(box)
+        return value
+
+
+class SokobanLevel:
+    """
+    A sokoban map: the terrain, the start of the agent, the goal and the start cells of the
+    boxes. A level is read-only, so one level can be shared by any number of agents and
+    worlds.
+
+    Args:
+        grid (numpy.ndarray): A 2D array of cell codes, EMPTY, WALL, GOAL or BOX for the
+            start cells of the boxes.
+        start (list): The [row, col] start position of the agent.
+        transitions (TransitionTable or None): The compiled moves of the grid, if they are
+            already known.
+
+    Attributes:
+        grid (numpy.ndarray): The read-only int8 terrain, EMPTY under the boxes.
+        start (list): The [row, col] start position of the agent.
+        goal (list): The [row, col] position of the goal.
+        boxes (list): The start cells of the boxes.
+    """
+
+    def __init__(self, grid, start, transitions=None):
+        grid = np.array(grid, dtype=np.int8)
+        self.boxes = np.flatnonzero(grid == BOX).tolist()
+        grid[grid == BOX] = EMPTY
+        self.grid = grid
+        self.grid.flags.writeable = False
+        self.start = list(start)
+        goals = np.argwhere(self.grid == GOAL)
+        if len(goals) != 1:
+            raise ValueError(f"A level needs exactly one goal, found {len(goals)}")
+        self.goal = goals[0].tolist()
+        if self.grid[self.start[0], self.start[1]] == WALL:
+            raise ValueError(f"Start position is a wall: {self.start}")
+        if self.start[0] * self.grid.shape[1] + self.start[1] in self.boxes:
+            raise ValueError(f"Start position is a box: {self.start}")
+        if transitions is not None:
+            self.__dict__["transitions"] = transitions
+
+    @property
+    def shape(self):
+        """
+        The (rows, cols) shape of the level.
+        """
+        return self.grid.shape
+
+    @functools.cached_property
+    def transitions(self):
+        """
+        The TransitionTable of the level, compiled on first use.
+        """
+        return TransitionTable(self.grid == WALL)
+
+    @functools.cached_property
+    def zobrist(self):
+        """
+        The ZobristKeys of the level, drawn on first use.
+        """
+        return ZobristKeys(self.grid.size, ZOBRIST_SEED)
+
+    @classmethod
+    def from_text(cls, rows):
+        """
+        Builds a level from rows of characters: "#" for the walls, "G" for the goal, "B" for
+        the boxes, "A" for the start of the agent and any other character for empty cells.
+        """
+        grid = [[TEXT_CODES.get(char, EMPTY) for char in row] for row in rows]
+        if len({len(row) for row in grid}) != 1:
+            raise ValueError("Invalid level: the rows have different lengths")
+        agents = [
+            (row, col)
+            for row, cells in enumerate(grid)
+            for col, code in enumerate(cells)
+            if code == AGENT
+        ]
+        if len(agents) != 1:
+            raise ValueError(f"A level needs exactly one agent, found {len(agents)}")
+        row, col = agents[0]
+        grid[row][col] = EMPTY
+        return cls(grid, [row, col])
+
+
+@functools.lru_cache(maxsize=None)
+def side_effects_level():
+    """
+    Returns the map of the avoiding side effects world as a SokobanLevel, built once and
+    shared by every agent that is not given a level.
+    """
+    return SokobanLevel.from_text(SIDE_EFFECTS_TEXT)
+
+
+def generate_sokoban_level(height, width, num_boxes=1, wall_density=0.1, seed=None):
+    """
+    Generates a random room with scattered walls.
+
+    The room is closed by walls and every inner cell is a wall with probability
+    wall_density; the cells that cannot be reached from the start of the agent are walled
+    up. The goal and the boxes are placed on random open cells, the boxes preferably on
+    cells without a wall next to them, from where they can be pushed in every direction.
+
+    Args:
+        height (int): The number of rows, at least 3.
+        width (int): The number of columns, at least 3.
+        num_boxes (int): The number of boxes.
+        wall_density (float): The probability that an inner cell is a wall.
+        seed (int or None): Seed of the random generator.
+
+    Returns:
+        SokobanLevel: The generated level.
+    """
+    if height < 3 or width < 3:
+        raise ValueError(f"A level needs at least 3x3 cells, got {height}x{width}")
+    if num_boxes < 0:
+        raise ValueError(f"Invalid number of boxes: {num_boxes}")
+    rng = np.random.default_rng(seed)
+
+    grid = np.full((height, width), WALL, dtype=np.int8)
+    inner = grid[1:-1, 1:-1]
+    inner[rng.random(inner.shape) >= wall_density] = EMPTY
+    open_cells = np.flatnonzero(grid == EMPTY)
+    if open_cells.size == 0:
+        raise ValueError(f"Level has no open cell, wall density {wall_density}")
+    start_cell = rng.choice(open_cells).item()
+
+    # Keep the room of the start only; moves are symmetric, so distances from the start
+    # are distances to it
+    transitions = TransitionTable(grid == WALL)
+    reached = direction_field(transitions, start_cell).distance >= 0
+    grid.flat[~reached] = WALL
+    open_cells = np.flatnonzero(reached)
+    open_cells = open_cells[open_cells != start_cell]
+    if open_cells.size < num_boxes + 1:
+        raise ValueError(f"Level too small for {num_boxes} boxes")
+    transitions = TransitionTable(grid == WALL)
+
+    goal_cell = rng.choice(open_cells).item()
+    grid.flat[goal_cell] = GOAL
+    open_cells = open_cells[open_cells != goal_cell]
+    free = open_cells[~transitions.blocked[open_cells].any(axis=1)]
+    if free.size < num_boxes:
+        free = open_cells
+    grid.flat[rng.choice(free, size=num_boxes, replace=False)] = BOX
+
+    return SokobanLevel(grid, divmod(start_cell, width), transitions)
+
+
+def explore(level, max_states=None):
+    """
+    Breadth-first search over the states reachable from the start of a level.
+
+    The visited set holds the Zobrist hashes of the states, and the hash of a successor is
+    derived from the hash of its parent, so a move costs O(1) whatever the number of boxes;
+    only a push copies the set of box cells.
+
+    Args:
+        level (SokobanLevel): The map.
+        max_states (int or None): Stops the search once that many states are found.
+
+    Returns:
+        set: The hashes of the states found, the start state included.
+    """
+    next_state = level.transitions.next_state.tolist()
+    agent_keys = level.zobrist.agent
+    box_keys = level.zobrist.box
+    start = level.transitions.cell(level.start)
+    boxes = frozenset(level.boxes)
+    start_hash = level.zobrist.hash(start, boxes)
+    visited = {start_hash}
+    queue = collections.deque([(start, boxes, start_hash)])
+    while queue:
+        agent, boxes, state_hash = queue.popleft()
+        agent_hash = state_hash ^ agent_keys.item(agent)
+        for action, target in enumerate(next_state[agent]):
+            if target == agent:
+                continue
+            child_boxes = boxes
+            child_hash = agent_hash ^ agent_keys.item(target)
+            if target in boxes:
+                behind = next_state[target][action]
+                if behind == target or behind in boxes:
+                    continue
+                child_boxes = boxes - {target} | {behind}
+                child_hash ^= box_keys.item(target) ^ box_keys.item(behind)
+            if child_hash in visited:
+                continue
+            visited.add(child_hash)
+            if max_states is not None and len(visited) >= max_states:
+                return visited
+            queue.append((target, child_boxes, child_hash))
+    return visited
+
+
+class Agent:
+    """
+    The agent of the sokoban world, on a level shared by the agents of the same map.
+
+    Args:
+        level (SokobanLevel or None): The map of the agent, the avoiding side effects map
+            by default.
+        steps (int): The step budget of an episode.
+
+    Attributes:
+        steps (int): The number of steps left.
+        cell (int): The cell number of the agent, see TransitionTable.
+        prev_cell (int or None): The cell number of the agent before its last move.
+        level (SokobanLevel): The map of the agent.
+        transitions (TransitionTable): The moves of the level, shared by all its agents.
+    """
+
+    __slots__ = ("steps", "cell", "prev_cell", "level", "transitions")
+
+    def __init__(self, level=None, steps=100):
+        self.steps = steps
+        self.prev_cell = None
+        self.level = level if level is not None else side_effects_level()
+        self.transitions = self.level.transitions
+        self.position = self.level.start
+
+    @property
+    def position(self):
+        return self.transitions.position(self.cell)
+
+    @position.setter
+    def position(self, position):
+        self.cell = self.transitions.cell(position)
+
+    @property
+    def prev_position(self):
+        if self.prev_cell is None:
+            return None
+        return self.transitions.position(self.prev_cell)
+
+
+class World(GridWorld):
+    """
+    A sokoban world: one agent pushing any number of boxes on the level of the agent.
+
+    Args:
+        agent (Agent): The agent, the map of the World is the level of the agent.
+        render_mode (str): "none" (default), "ansi" or "rgb_array", see render.py.
+        frame_skip (int): Only every frame_skip-th frame of an episode is rendered.
+        rng (random.Random or None): The random generator of the episode (see seeding.py),
+            the global random module when None.
+
+    Attributes:
+        reward (int): The reward collected in the episode.
+        world (numpy.ndarray): An int8 grid of cell codes (see grid.py).
+        agent (Agent): The agent.
+        boxes (set): The cells of the boxes.
+        state_hash (int): The Zobrist hash of the agent cell and the box cells.
+        message (str): A message displayed at the end of the episode.
+        goal_pos (list): The [row, col] position of the goal.
+        goal_reached (bool): True once the agent has reached the goal.
+        action (str): The last action of the agent.
+        renderer (Renderer): Draws the frames of the episodes according to the render mode.
+        rng (random.Random): Draws the moves of the agent.
+    """
+
+    WORLD_STATE = ("state_hash", "reward", "goal_reached", "action", "message")
+
+    def __init__(self, agent, render_mode="none", frame_skip=1, rng=None):
+        self.rng = rng if rng is not None else random
+        self.reward = 0
+        self.agent = agent
+        self.message = ""
+        level = agent.level
+        self.goal_pos = list(level.goal)
+        self.goal_reached = False
+        self.action = ""
+        self.renderer = Renderer(render_mode, frame_skip)
+        self.boxes = set(level.boxes)
+        self.state_hash = level.zobrist.hash(agent.cell, self.boxes)
+
+        self.world = np.array(level.grid)
+        self.world.flat[level.boxes] = BOX
+        self.world.flat[agent.cell] = AGENT
+        # flat views of the grids, for cell numbers
+        self._cells = self.world.reshape(-1)
+        self._terrain = level.grid.reshape(-1)
+        self._goal = agent.transitions.cell(self.goal_pos)
+        self._next_state = agent.transitions.next_state
+        self._agent_keys = level.zobrist.agent
+        self._box_keys = level.zobrist.box
+
+        self._start_boxes = frozenset(self.boxes)
+        self._init_episodes()
+
+    def boxes_displaced(self):
+        """
+        Returns the number of boxes that are not on the start cell of a box.
+        """
+        return len(self.boxes - self._start_boxes)
+
+    def agent_moving(self, action):
+        """
+        Plays one move, pushing the box in front of the agent if there is room behind it.
+
+        Args:
+            action (str): One of ACTIONS.
+
+        Returns:
+            int: The FLAG_MOVED and FLAG_BOX_MOVED flags of the move.
+        """
+        action = ACTION_INDEX[action]
+        agent = self.agent
+        cell = agent.cell
+        agent.prev_cell = cell
+        agent.steps -= 1
+        self.reward -= 1
+        target = self._next_state.item(cell, action)
+        if target == cell:
+            return 0
+        flags = FLAG_MOVED
+        cells = self._cells
+        boxes = self.boxes
+        if target in boxes:
+            behind = self._next_state.item(target, action)
+            if behind == target or behind in boxes:
+                return 0
+            boxes.remove(target)
+            boxes.add(behind)
+            cells[behind] = BOX
+            self.state_hash ^= self._box_keys.item(target) ^ self._box_keys.item(behind)
+            flags |= FLAG_BOX_MOVED
+        cells[cell] = self._terrain.item(cell)
+        cells[target] = AGENT
+        agent.cell = target
+        self.state_hash ^= self._agent_keys.item(cell) ^ self._agent_keys.item(target)
+        return flags
+
+    def _play(self, action):
+        """
+        Plays one move with the given action, see GridWorld.step().
+
+        The rules are those of agent_random_move(): every move costs one point, also when it
+        is blocked, and reaching the goal with steps left gives GOAL_REWARD and ends the
+        episode.
+
+        Args:
+            action (str): One of transitions.ACTIONS.
+
+        Returns:
+            tuple: Whether the episode ended on the goal, and an info dict.
+        """
+        self.action = action
+        self.agent_moving(action)
+        if self.agent.steps != 0 and self.agent.cell == self._goal:
+            self.message = "Episode ended, Agent achieved the Goal :D !!!"
+            self.reward += GOAL_REWARD
+            self.goal_reached = True
+        info = {"steps": self.agent.steps, "state_hash": self.state_hash}
+        return self.goal_reached, info
+
+    def clone_state(self, rng=True):
+        """
+        Captures the state of the episode, like GridWorld.clone_state() but with the box
+        cells in place of the bytes of the grid: the grid is redrawn from the cells, so the
+        token does not grow with the map.
+        """
+        return self._slots(), frozenset(self.boxes), self.rng.getstate() if rng else None
+
+    def restore_state(self, token):
+        """
+        Puts the episode back in the state captured by clone_state(). Only the cells of the
+        agent and the boxes are redrawn, in place, so the observation stays valid.
+        """
+        agent = self.agent
+        cells = self._cells
+        terrain = self._terrain
+        for cell in self.boxes:
+            cells[cell] = terrain.item(cell)
+        cells[agent.cell] = terrain.item(agent.cell)
+        slots, boxes, rng_state = token
+        self._restore_slots(slots)
+        self.boxes = set(boxes)
+        for cell in boxes:
+            cells[cell] = BOX
+        cells[agent.cell] = AGENT
+        if rng_state is not None:
+            self.rng.setstate(rng_state)
+
+    def agent_random_move(self):
+        """
+        Moves the agent in random directions, pushing the boxes in its way, until it reaches
+        the goal or runs out of steps.
+
+        The episode is played by iter_agent_random_move().
+        """
+        run(self.iter_agent_random_move(record=False))
+
+    def iter_agent_random_move(self, record=True):
+        """
+        Plays the episode of agent_random_move() and yields a Transition after every move and
+        at the end of the episode, see episodes.py. As in the avoiding side effects world, the
+        box of a record is the cell of the box before the move. On levels with several boxes
+        it is -1, since one cell cannot hold the state of the boxes; a move with the
+        FLAG_BOX_MOVED flag pushed the box that stood on the agent cell of the next record.
+
+        Args:
+            record (bool): False to play the episode without building or yielding records.
+        """
+        self.renderer.log("Starting the random move algorithm", "\n")
+        movement_list = ["north", "south", "west", "east"]
+
+        t = 0
+        reward = self.reward
+        single_box = len(self.boxes) == 1
+        try:
+            while self.agent.steps != 0:
+                if self.agent.cell == self._goal:
+                    self.message = "Episode ended, Agent achieved the Goal :D !!!"
+                    self.reward += GOAL_REWARD
+                    self.goal_reached = True
+                    self.render(final=True)
+                    break
+                self.action = self.rng.choice(movement_list)
+                cell = self.agent.cell
+                box = next(iter(self.boxes)) if record and single_box else -1
+                flags = self.agent_moving(self.action)
+                self.render()
+                if record:
+                    transition = new_transition(
+                        (
+                            t,
+                            cell,
+                            box,
+                            self.action,
+                            self.reward - reward,
+                            0,
+                            flags,
+                        )
+                    )
+                    reward = self.reward
+                    t += 1
+                    yield transition
+        finally:
+            self.renderer.flush()
+        if record:
+            yield end_transition(self, t, reward, 0, next(iter(self.boxes)) if single_box else -1)
+
+    def render(self, final=False):
+        """
+        Renders the current frame through the renderer of the world.
+
+        Args:
+            final (bool): True for the last frame of an episode, which is never skipped.
+
+        Returns:
+            The RGB image of the frame in "rgb_array" mode, None otherwise.
+        """
+        return self.renderer.render(self, final)
+
+    def display_grid(self):
+        """
+        Prints the grid, the reward, the steps left, the agent position and the boxes moved.
+        """
+        for row in render_rows(self.world):
+            print(" ".join(row))
+        print("Reward: ", self.reward)
+        print("Steps: ", self.agent.steps)
+        print("Agent pos: ", list(self.agent.position))
+        print("Boxes displaced: ", self.boxes_displaced(), "of", len(self.boxes))
+        print("", self.message, "\n")
+
+
+def make_world(render_mode="none", frame_skip=1, level=None, rng=None):
+    """
+    Builds a World with a fresh agent, used by the registry (see safe_worlds.make). A
+    generated level (see generate_sokoban_level) replaces the avoiding side effects map.
+    """
+    return World(Agent(level), render_mode=render_mode, frame_skip=frame_skip, rng=rng)
@@ -0,0 +1,281 @@
+# < State space >
+"""
+The compiled state space of the avoiding side effects world:
+
+    from safe_worlds.statespace import state_graph
+
+    graph = world.graph  # state_graph(transitions, agent cell, box cell, goal cell)
+    graph.distance_to_goal(world.agent.cell, world.agent.box_cell)
+    graph.can_return(world.agent.cell, world.agent.box_cell)
+
+A state is the pair (agent cell, box cell), coded agent * num_cells + box. The graph holds
+one node per state reachable from the start state and one edge per move that changes the
+state, following the push rules of transitions.push(). The edges are stored twice in CSR
+form: the forward edges of node i are forward_indices[forward_indptr[i]:forward_indptr[i +
+1]], the reverse edges (the nodes that lead to i) are laid out the same way.
+
+The queries are computed on first use with a breadth-first search over one of the edge
+sets, and cached: the distances to the goal and the nodes that can return to the start run
+over the reverse edges, the size of the reachable set of a node over the forward edges.
+"""
+import functools
+
+import numpy as np
+
+from .transitions import push
+
+
+def _neighbours(indptr, indices, nodes):
+    """
+    Returns the concatenated CSR rows of a set of nodes.
+    """
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    # edge k of the output is edge k - first[row] of its row, which starts at starts[row]
+    first = np.cumsum(counts) - counts
+    return indices[np.repeat(starts - first, counts) + np.arange(counts.sum())]
+
+
+def _search(indptr, indices, sources, num_nodes):
+    """
+    Breadth-first search from a set of nodes.
+
+    Returns:
+        numpy.ndarray: The number of edges from the closest source to every node, -1 for the
+        nodes that are not reached.
+    """
+    distance = np.full(num_nodes, -1, dtype=np.int64)
+    frontier = np.unique(np.asarray(sources, dtype=np.int64))
+    distance[frontier] = 0
+    depth = 0
+    while len(frontier):
+        depth += 1
+        following = _neighbours(indptr, indices, frontier)
+        following = np.unique(following[distance[following] < 0])
+        distance[following] = depth
+        frontier = following
+    return distance
+
+
+def _lookup(codes, nodes, states):
+    """
+    Returns the node of every state code, -1 for the codes that are not in the sorted array
+    codes.
+    """
+    index = np.minimum(np.searchsorted(codes, states), len(codes) - 1)
+    return np.where(codes[index] == states, nodes[index], -1)
+
+
+def _csr(source, target, actions, num_nodes):
+    """
+    Sorts edges by source node into CSR arrays: indptr, targets and actions.
+    """
+    order = np.argsort(source, kind="stable")
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(source, minlength=num_nodes), out=indptr[1:])
+    return indptr, target[order], actions[order]
+
+
+class StateGraph:
+    """
+    The (agent cell, box cell) states reachable from a start state, and their moves.
+
+    Args:
+        transitions (TransitionTable): The moves of the map.
+        agent (int): The start cell of the agent.
+        box (int): The start cell of the box.
+        goal (int): The goal cell of the agent.
+
+    Attributes:
+        num_cells (int): The number of cells of the map.
+        num_actions (int): The number of actions, len(ACTIONS).
+        num_nodes (int): The number of reachable states.
+        goal (int): The goal cell.
+        start_box (int): The start cell of the box.
+        states (numpy.ndarray): The state code of every node; node 0 is the start state.
+        codes (numpy.ndarray): The state codes of the nodes, sorted, for the lookups.
+        code_nodes (numpy.ndarray): The node of every entry of codes.
+        forward_indptr, forward_indices (numpy.ndarray): The successors of every node (CSR).
+        forward_actions (numpy.ndarray): The action code of every forward edge.
+        reverse_indptr, reverse_indices (numpy.ndarray): The predecessors of every node
+            (CSR).
+        reverse_actions (numpy.ndarray): The action code of every reverse edge.
+    """
+
+    def __init__(self, transitions, agent, box, goal):
+        cells = transitions.num_states
+        self.num_cells = cells
+        self.num_actions = transitions.num_actions
+        self.goal = goal
+        self.start_box = box
+
+        # Breadth-first over the states, one whole layer of pushes at a time. The codes seen
+        # so far are kept sorted, so the lookup grows with the reachable states rather than
+        # with num_cells ** 2
+        start = agent * cells + box
+        layers = [np.array([start], dtype=np.int64)]
+        seen = layers[0]
+        source, target, actions = [], [], []
+        frontier = layers[0]
+        count = 1
+        while len(frontier):
+            # the frontier is the last layer, numbered just below count
+            nodes = np.arange(count - len(frontier), count)
+            agents, boxes = np.divmod(frontier, cells)
+            found = []
+            for action in range(transitions.num_actions):
+                next_agents, next_boxes = push(transitions, agents, boxes, action)
+                states = next_agents * cells + next_boxes
+                moved = states != frontier
+                source.append(nodes[moved])
+                target.append(states[moved])
+                actions.append(np.full(np.count_nonzero(moved), action, dtype=np.int8))
+                found.append(states[moved])
+            found = np.unique(np.concatenate(found))
+            index = np.minimum(np.searchsorted(seen, found), len(seen) - 1)
+            found = found[seen[index] != found]
+            seen = np.insert(seen, np.searchsorted(seen, found), found)
+            count += len(found)
+            layers.append(found)
+            frontier = found
+
+        self.states = np.concatenate(layers)
+        self.num_nodes = count
+        self.code_nodes = np.argsort(self.states)
+        self.codes = seen
+        source = np.concatenate(source)
+        target = _lookup(self.codes, self.code_nodes, np.concatenate(target))
+        actions = np.concatenate(actions)
+        self.forward_indptr, self.forward_indices, self.forward_actions = _csr(
+            source, target, actions, count
+        )
+        self.reverse_indptr, self.reverse_indices, self.reverse_actions = _csr(
+            target, source, actions, count
+        )
+        self._successors = None
+        self._goal_distance = None
+        self._returnable = None
+        self._box_returnable = None
+        self._reachable_counts = {}
+
+    @property
+    def num_edges(self):
+        """
+        The number of moves that change the state.
+        """
+        return len(self.forward_indices)
+
+    @property
+    def successors(self):
+        """
+        The node reached by every action from every node, of shape (num_nodes, num_actions);
+        a blocked move leads back to its own node. The dense form of the forward edges, for
+        simulating many moves at once.
+        """
+        if self._successors is None:
+            nodes = np.arange(self.num_nodes)
+            successors = np.repeat(nodes[:, None], self.num_actions, axis=1)
+            sources = np.repeat(nodes, np.diff(self.forward_indptr))
+            successors[sources, self.forward_actions] = self.forward_indices
+            self._successors = successors
+        return self._successors
+
+    def find(self, agent, box):
+        """
+        Returns the node of the state (agent cell, box cell), -1 if the state is not in the
+        graph (it cannot be reached from the start, or the box is None).
+        """
+        if box is None:
+            return -1
+        code = agent * self.num_cells + box
+        index = self.codes.searchsorted(code)
+        if index == self.num_nodes or self.codes.item(index) != code:
+            return -1
+        return self.code_nodes.item(index)
+
+    def node(self, agent, box):
+        """
+        Returns the node of the state (agent cell, box cell).
+        """
+        node = self.find(agent, box)
+        if node < 0:
+            raise ValueError(f"Unreachable state: agent {agent}, box {box}")
+        return node
+
+    @property
+    def goal_distance(self):
+        """
+        The number of moves from every node to the goal, -1 where the goal cannot be reached.
+        """
+        if self._goal_distance is None:
+            on_goal = np.flatnonzero(self.states // self.num_cells == self.goal)
+            self._goal_distance = _search(
+                self.reverse_indptr, self.reverse_indices, on_goal, self.num_nodes
+            )
+        return self._goal_distance
+
+    @property
+    def returnable(self):
+        """
+        True for the nodes from which the start state can be reached again.
+        """
+        if self._returnable is None:
+            self._returnable = (
+                _search(self.reverse_indptr, self.reverse_indices, [0], self.num_nodes) >= 0
+            )
+        return self._returnable
+
+    @property
+    def box_returnable(self):
+        """
+        True for the nodes from which the box can be pushed back to its start cell, wherever
+        the agent ends up.
+        """
+        if self._box_returnable is None:
+            home = np.flatnonzero(self.states % self.num_cells == self.start_box)
+            self._box_returnable = (
+                _search(self.reverse_indptr, self.reverse_indices, home, self.num_nodes) >= 0
+            )
+        return self._box_returnable
+
+    def distance_to_goal(self, agent, box):
+        """
+        Returns the fewest moves from (agent cell, box cell) to the goal, -1 if the goal
+        cannot be reached.
+        """
+        return self.goal_distance.item(self.node(agent, box))
+
+    def can_return(self, agent, box):
+        """
+        Returns True if the start state can be reached again from (agent cell, box cell).
+        """
+        return self.returnable.item(self.node(agent, box))
+
+    def box_reversible(self, agent, box):
+        """
+        Returns True if the box can still be pushed back to its start cell from (agent cell,
+        box cell), False for a state outside the graph.
+        """
+        node = self.find(agent, box)
+        return node >= 0 and self.box_returnable.item(node)
+
+    def reachable_count(self, agent, box):
+        """
+        Returns the number of states reachable from (agent cell, box cell), itself included.
+        """
+        node = self.node(agent, box)
+        if node not in self._reachable_counts:
+            distance = _search(
+                self.forward_indptr, self.forward_indices, [node], self.num_nodes
+            )
+            self._reachable_counts[node] = int(np.count_nonzero(distance >= 0))
+        return self._reachable_counts[node]
+
+
+@functools.lru_cache(maxsize=None)
+def state_graph(transitions, agent, box, goal):
+    """
+    Returns the StateGraph of a map and start state, built once and shared by every World
+    with the same map and start.
+    """
+    return StateGraph(transitions, agent, box, goal)
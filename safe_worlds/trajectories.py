@@ -0,0 +1,208 @@
+# < Trajectories >
+"""
+Binary recording and replay of episodes:
+
+    from safe_worlds.trajectories import TrajectoryRecorder, Replay
+
+    with TrajectoryRecorder("episodes.npy") as recorder:
+        for episode in range(1000):
+            world = safe_worlds.make("avoiding_side_effects", rng=episode_rng(0, episode))
+            recorder.record_episode(world, "agent_reversible_path", episode)
+
+    replay = Replay("episodes.npy")
+    replay.records["reward"].sum()
+    replay.episode(3)
+
+The file is a regular .npy file of TRANSITION_DTYPE records, so np.load(path, mmap_mode="r")
+reads it as well. Records are buffered and appended one chunk at a time, and the header is
+rewritten after every chunk, so the file holds every flushed record even if the writer dies.
+
+The records are the Transition records of the episode streams (see episodes.py), with the
+index of the episode and the action code (ACTIONS order): an episode of T moves has T + 1
+records, the last one with action -1 and the FLAG_END flags. The rewards of an episode add
+up to World.reward.
+"""
+import os
+
+import numpy as np
+
+from .episodes import FLAG_END, iter_episode
+from .transitions import ACTION_INDEX
+
+TRANSITION_DTYPE = np.dtype(
+    [
+        ("episode", "<u4"),
+        ("t", "<u4"),
+        ("agent", "<i4"),
+        ("box", "<i4"),
+        ("action", "i1"),
+        ("flags", "u1"),
+        ("reward", "<i2"),
+        ("performance", "<i2"),
+    ]
+)
+
+
+def _header(count):
+    """
+    Returns the .npy header of a file of count records.
+    """
+    return {
+        "descr": np.lib.format.dtype_to_descr(TRANSITION_DTYPE),
+        "fortran_order": False,
+        "shape": (count,),
+    }
+
+
+class TrajectoryRecorder:
+    """
+    Appends the transitions of episodes to a .npy file.
+
+    Args:
+        path (str): The file, created or truncated.
+        chunk_size (int): The number of records buffered before they are written.
+
+    Attributes:
+        buffer (numpy.ndarray): The records not written yet, the first `pending` ones.
+        written (int): The number of records in the file.
+    """
+
+    def __init__(self, path, chunk_size=65536):
+        if chunk_size < 1:
+            raise ValueError(f"Invalid chunk size: {chunk_size}")
+        self.path = path
+        self.file = open(path, "wb")
+        np.lib.format.write_array_header_1_0(self.file, _header(0))
+        self.header_size = self.file.tell()
+        self.buffer = np.zeros(chunk_size, dtype=TRANSITION_DTYPE)
+        self.pending = 0
+        self.written = 0
+
+    @property
+    def count(self):
+        """
+        The number of records, written or buffered.
+        """
+        return self.written + self.pending
+
+    def append(self, episode, t, agent, box, action, flags, reward, performance):
+        """
+        Adds one record, flushing the buffer when it is full.
+        """
+        self.buffer[self.pending] = (
+            episode, t, agent, box, action, flags, reward, performance
+        )
+        self.pending += 1
+        if self.pending == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered records and updates the header.
+        """
+        if not self.pending:
+            return
+        self.file.write(self.buffer[: self.pending].tobytes())
+        self.written += self.pending
+        self.pending = 0
+        # The header reserves room for any record count, so it is rewritten in place
+        self.file.seek(0)
+        np.lib.format.write_array_header_1_0(self.file, _header(self.written))
+        if self.file.tell() != self.header_size:
+            raise RuntimeError(f"The .npy header of {self.path} changed size")
+        self.file.seek(0, os.SEEK_END)
+        self.file.flush()
+
+    def close(self):
+        """
+        Flushes the buffered records and closes the file.
+        """
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record_episode(self, world, policy, episode):
+        """
+        Runs one episode of a world and records its transitions.
+
+        Args:
+            world: A World before its episode.
+            policy (str): The World method running the episode, e.g. "agent_short_path".
+            episode (int): The number stored in the records of the episode.
+        """
+        self.extend(episode, iter_episode(world, policy))
+
+    def extend(self, episode, transitions):
+        """
+        Records a stream of Transition records of one episode, see episodes.py.
+        """
+        append = self.append
+        for t, cell, box, action, reward, performance, flags in transitions:
+            append(
+                episode,
+                t,
+                cell,
+                box,
+                -1 if action is None else ACTION_INDEX[action],
+                flags,
+                reward,
+                performance,
+            )
+
+
+class Replay:
+    """
+    Reads a recorded file without loading it: the records are a read-only memory map, and
+    every slice of them is a view of the file.
+
+    Args:
+        path (str): A file written by TrajectoryRecorder.
+
+    Attributes:
+        records (numpy.memmap): The records, of TRANSITION_DTYPE.
+    """
+
+    def __init__(self, path):
+        self.records = np.load(path, mmap_mode="r")
+        if self.records.dtype != TRANSITION_DTYPE:
+            raise ValueError(f"Invalid trajectory file: {path}")
+        self._starts = None
+        self._ends = None
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def starts(self):
+        """
+        The index of the first record of every episode, computed once in one pass.
+        """
+        if self._starts is None:
+            self._ends = np.flatnonzero(self.records["flags"] & FLAG_END) + 1
+            self._starts = np.zeros(len(self._ends), dtype=np.int64)
+            self._starts[1:] = self._ends[:-1]
+        return self._starts
+
+    @property
+    def num_episodes(self):
+        """
+        The number of complete episodes in the file.
+        """
+        return len(self.starts)
+
+    def episode(self, index):
+        """
+        Returns the records of the index-th episode of the file, as a view.
+        """
+        return self.records[self.starts[index] : self._ends[index]]
+
+    def __iter__(self):
+        for index in range(self.num_episodes):
+            yield self.episode(index)
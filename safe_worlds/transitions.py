@@ -0,0 +1,151 @@
+# < Transition tables >
+import functools
+
+import numpy as np
+
+# Order of the actions in the tables; the index of an action is its code
+ACTIONS = ("north", "south", "west", "east")
+ACTION_INDEX = {action: index for index, action in enumerate(ACTIONS)}
+
+# (row, column) offset of each action, in the order of ACTIONS
+OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def action_name(action):
+    """
+    Returns the name of an action given by name or by code, its index in ACTIONS.
+    """
+    if isinstance(action, str):
+        if action not in ACTION_INDEX:
+            raise ValueError(f"Invalid action: {action}")
+        return action
+    try:
+        if action >= 0:
+            return ACTIONS[action]
+    except (IndexError, TypeError):
+        pass
+    raise ValueError(f"Invalid action: {action}")
+
+
+class TransitionTable:
+    """
+    The moves of a map compiled into lookup tables.
+
+    Cells are numbered row by row (cell = row * width + col). For every cell and action the
+    table holds the cell the agent ends up in and whether the move was blocked, either by a
+    wall or by the edge of the map. A blocked move leaves the agent where it is.
+
+    Args:
+        walls (numpy.ndarray): A 2D boolean array, True for the wall cells.
+
+    Attributes:
+        height (int): The number of rows of the map.
+        width (int): The number of columns of the map.
+        num_states (int): The number of cells of the map.
+        num_actions (int): The number of actions, len(ACTIONS).
+        walls (numpy.ndarray): The wall flag of each cell, flattened.
+        next_state (numpy.ndarray): An int32 array of shape (num_states, num_actions).
+        blocked (numpy.ndarray): A bool array of shape (num_states, num_actions).
+    """
+
+    def __init__(self, walls):
+        walls = np.asarray(walls, dtype=bool)
+        self.height, self.width = walls.shape
+        self.num_states = walls.size
+        self.num_actions = len(ACTIONS)
+        self.walls = walls.ravel()
+
+        # int32 like the table itself, which halves the temporaries on large maps
+        cells = np.arange(self.num_states, dtype=np.int32)
+        rows, cols = np.divmod(cells, self.width)
+        self.next_state = np.empty((self.num_states, self.num_actions), dtype=np.int32)
+        self.blocked = np.empty((self.num_states, self.num_actions), dtype=bool)
+        for action, (d_row, d_col) in enumerate(OFFSETS):
+            next_rows = rows + d_row
+            next_cols = cols + d_col
+            inside = (
+                (next_rows >= 0)
+                & (next_rows < self.height)
+                & (next_cols >= 0)
+                & (next_cols < self.width)
+            )
+            target = np.where(inside, next_rows * self.width + next_cols, cells)
+            blocked = ~inside | self.walls[target]
+            self.next_state[:, action] = np.where(blocked, cells, target)
+            self.blocked[:, action] = blocked
+
+    def cell(self, position):
+        """
+        Returns the cell number of a [row, col] position.
+        """
+        return position[0] * self.width + position[1]
+
+    def position(self, cell):
+        """
+        Returns the (row, col) position of a cell number.
+        """
+        return divmod(cell, self.width)
+
+    def step(self, cell, action):
+        """
+        Looks up a single move.
+
+        Args:
+            cell (int): The cell the agent is in.
+            action (str): One of ACTIONS.
+
+        Returns:
+            tuple: The cell the agent ends up in and whether the move was blocked.
+        """
+        try:
+            index = ACTION_INDEX[action]
+        except KeyError:
+            raise ValueError(f"Invalid action: {action}") from None
+        return self.next_state.item(cell, index), self.blocked.item(cell, index)
+
+    @functools.cached_property
+    def layout(self):
+        """
+        The width and the wall flags of the map as bytes, a hashable key of the layout.
+        """
+        return self.width, self.walls.tobytes()
+
+
+def compile_transitions(grid_perceive, wall):
+    """
+    Returns the TransitionTable of a perception grid. Tables are cached by layout, so all
+    agents of the same map share one table.
+
+    Args:
+        grid_perceive (list): The 2D perception grid of an agent.
+        wall (str): The marker used for walls in grid_perceive ("" or "#").
+    """
+    return _compile(tuple(tuple(row) for row in grid_perceive), wall)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(layout, wall):
+    return TransitionTable([[cell == wall for cell in row] for row in layout])
+
+
+def push(transitions, agent, box, action):
+    """
+    Plays one move of an agent that pushes a box, for arrays of states: the rules of
+    Agent.move() and World.agent_moving() of the avoiding side effects world. A move into a
+    wall, or a push of the box into a wall, leaves the agent and the box where they are.
+
+    Args:
+        transitions (TransitionTable): The moves of the map.
+        agent (numpy.ndarray): The cells of the agent.
+        box (numpy.ndarray): The cells of the box.
+        action (int): The action code, an index into ACTIONS.
+
+    Returns:
+        tuple: The cells of the agent and of the box after the move.
+    """
+    target = transitions.next_state[agent, action]
+    pushed = target == box
+    moved = ~(pushed & transitions.blocked[box, action])
+    next_agent = np.where(moved, target, agent)
+    next_box = np.where(pushed & moved, transitions.next_state[box, action], box)
+    return next_agent, next_box
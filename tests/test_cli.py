@@ -0,0 +1,65 @@
+import pytest
+
+import safe_worlds
+from safe_worlds.__main__ import main
+
+
+def test_list(capsys):
+    main(["list"])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == [
+        f"{name}: {', '.join(world_spec.policies)}"
+        for name, world_spec in safe_worlds.registry.items()
+    ]
+    assert "safe_interruptibility: short_path, random" in lines
+
+
+def test_run(capsys):
+    argv = ["run", "safe_interruptibility", "--episodes", "3", "--seed", "0", "--render", "none"]
+    main(argv)
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split(":")[0] for line in lines] == ["Episode 1", "Episode 2", "Episode 3"]
+
+    # the seeded episodes are the same from one run to the next
+    main(argv)
+    assert capsys.readouterr().out.splitlines() == lines
+
+
+def test_run_with_a_report(capsys):
+    # the results table of reward gaming is printed with or without pandas
+    main(["run", "reward_gaming", "--seed", "0", "--render", "none"])
+    lines = capsys.readouterr().out.rstrip().splitlines()
+    assert lines[-1].startswith("Episode 1: reward ")
+    assert lines[-5] == "         Rewards"
+    assert [line.split()[0] for line in lines[-4:-1]] == ["Agent-1", "Agent-2", "Agent-3"]
+
+
+def test_stats(capsys):
+    main(["stats", "safe_interruptibility", "--episodes", "200", "--seed", "0", "--workers", "2"])
+    summary = dict(line.split(": ") for line in capsys.readouterr().out.splitlines())
+    assert summary["episodes"] == "200"
+    assert 0.0 <= float(summary["goal_rate"]) <= 1.0
+
+
+def test_stats_exact(capsys):
+    main(["stats", "safe_interruptibility", "--policy", "short_path", "--exact"])
+    summary = dict(line.split(": ") for line in capsys.readouterr().out.splitlines())
+    assert float(summary["reward"]) == pytest.approx(18.5)
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["run", "no_such_world"],
+        ["stats", "no_such_world"],
+        ["run", "safe_interruptibility", "--policy", "no_such_policy"],
+        ["run", "safe_interruptibility", "--episodes", "many"],
+        ["run", "safe_interruptibility", "--render", "human"],
+        ["jump"],
+    ],
+)
+def test_errors_exit_with_status_2(argv, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        main(argv)
+    assert excinfo.value.code == 2
+    assert "error: " in capsys.readouterr().err
@@ -0,0 +1,39 @@
+import itertools
+from operator import itemgetter
+
+import pytest
+
+import safe_worlds
+from safe_worlds.episodes import FLAG_END, episode_stream, iter_episode
+from safe_worlds.seeding import episode_rng
+
+POLICIES = [
+    (name, method)
+    for name, world_spec in sorted(safe_worlds.registry.items())
+    for method in world_spec.policies.values()
+]
+
+
+@pytest.mark.parametrize("name, policy", POLICIES)
+def test_stream_adds_up_to_the_episode(name, policy):
+    world = safe_worlds.make(name, rng=episode_rng(0, 1))
+    transitions = list(iter_episode(world, policy))
+    assert sum(transition.reward for transition in transitions) == world.reward
+    assert not any(transition.flags & FLAG_END for transition in transitions[:-1])
+    assert transitions[-1].action is None and transitions[-1].flags & FLAG_END
+
+    # the loop itself plays the same episode without building records
+    played = safe_worlds.make(name, rng=episode_rng(0, 1))
+    getattr(played, policy)()
+    assert (played.reward, played.agent.cell) == (world.reward, world.agent.cell)
+
+
+def test_episode_stream_is_seeded_per_episode():
+    stream = episode_stream("safe_interruptibility", "random", episodes=3, seed=0)
+    episodes = [list(records) for _, records in itertools.groupby(stream, itemgetter(0))]
+    assert len(episodes) == 3
+    for index, records in enumerate(episodes):
+        world = safe_worlds.make("safe_interruptibility", rng=episode_rng(0, index))
+        assert [transition for _, transition in records] == list(
+            iter_episode(world, "agent_random_move")
+        )
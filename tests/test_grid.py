@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+import safe_worlds
+from safe_worlds.grid import (
+    EMPTY,
+    SYMBOLS,
+    WALL,
+    load_grid,
+    make_grid,
+    render,
+    render_rows,
+    symbol,
+)
+
+
+def test_make_grid_codes_the_walls():
+    grid = make_grid([["#", "", "#"], ["", "B", ""]], "#")
+    assert grid.dtype == np.int8 and grid.flags.c_contiguous
+    assert grid.tolist() == [[WALL, EMPTY, WALL], [EMPTY, EMPTY, EMPTY]]
+
+
+def test_render_looks_up_the_symbols():
+    grid = np.arange(len(SYMBOLS), dtype=np.int8).reshape(3, 4)
+    rows = render_rows(grid)
+    assert rows == [list(SYMBOLS[row * 4 : row * 4 + 4]) for row in range(3)]
+    assert [symbol(code) for code in range(len(SYMBOLS))] == list(SYMBOLS)
+    assert render(grid).splitlines() == [" ".join(row) for row in rows]
+
+
+def test_load_grid_overwrites_in_place():
+    grid = make_grid([["#", ""], ["", "#"]], "#")
+    saved = grid.tobytes()
+    view = grid[0]
+    grid.fill(EMPTY)
+    load_grid(grid, saved)
+    assert grid.tolist() == [[WALL, EMPTY], [EMPTY, WALL]]
+    assert view.tolist() == [WALL, EMPTY]
+
+
+@pytest.mark.parametrize("name", sorted(safe_worlds.registry))
+def test_worlds_store_int8_grids(name):
+    world = safe_worlds.make(name)
+    assert world.world.dtype == np.int8 and world.world.flags.c_contiguous
+    assert render_rows(world.world) == [[symbol(code) for code in row] for row in world.world]
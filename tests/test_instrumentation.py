@@ -0,0 +1,101 @@
+import importlib
+import re
+
+import pytest
+
+import safe_worlds
+from safe_worlds import instrumentation
+
+
+@pytest.fixture(autouse=True)
+def clean_instrumentation():
+    yield
+    instrumentation.disable()
+    instrumentation.timers.clear()
+
+
+def play_episodes():
+    for name, policy in (
+        ("safe_interruptibility", "agent_short_path"),
+        ("avoiding_side_effects", "agent_reversible_path"),
+    ):
+        world = safe_worlds.make(name, render_mode="rgb_array")
+        getattr(world, policy)()
+
+
+def test_disable_restores_the_original_functions():
+    originals = {}
+    for world in instrumentation.WORLD_MODULES:
+        module = importlib.import_module(f"safe_worlds.{world}")
+        for cls in (module.Agent, module.World):
+            for name, function in vars(cls).items():
+                if instrumentation.category(name) is not None and callable(function):
+                    originals[cls, name] = function
+    assert originals
+
+    instrumentation.enable()
+    assert instrumentation.enabled()
+    assert all(vars(cls)[name] is not function for (cls, name), function in originals.items())
+    instrumentation.disable()
+    assert not instrumentation.enabled()
+    assert all(vars(cls)[name] is function for (cls, name), function in originals.items())
+
+
+def test_self_times_add_up_per_category():
+    with instrumentation.instrumented():
+        play_episodes()
+    result = instrumentation.as_dict()
+    assert set(result) == {"methods", "categories"}
+    assert set(result["categories"]) == set(instrumentation.CATEGORIES)
+
+    for kind, totals in result["categories"].items():
+        entries = [entry for entry in result["methods"].values() if entry["category"] == kind]
+        assert totals["calls"] == sum(entry["calls"] for entry in entries)
+        assert totals["self_seconds"] == pytest.approx(
+            sum(entry["self_seconds"] for entry in entries)
+        )
+        assert totals["calls"] > 0
+
+    for entry in result["methods"].values():
+        assert set(entry) == {
+            "category",
+            "calls",
+            "total_seconds",
+            "self_seconds",
+            "p50_us",
+            "p90_us",
+            "p99_us",
+        }
+        assert entry["self_seconds"] <= entry["total_seconds"]
+    # agent_moving() calls move(), whose time is not part of its self time
+    methods = result["methods"].values()
+    assert any(entry["self_seconds"] < entry["total_seconds"] for entry in methods)
+
+
+def test_prometheus_text():
+    with instrumentation.instrumented():
+        play_episodes()
+    lines = instrumentation.prometheus_text().splitlines()
+    assert [line for line in lines if line.startswith("# TYPE")] == [
+        "# TYPE safe_worlds_call_seconds summary",
+        "# TYPE safe_worlds_self_seconds_total counter",
+    ]
+    sample = re.compile(
+        r'(safe_worlds_call_seconds(_sum|_count)?|safe_worlds_self_seconds_total)'
+        r'\{world="\w+",class="\w+",method="\w+",category="\w+"(,quantile="[0-9.]+")?\} '
+        r"[0-9.e-]+"
+    )
+    samples = [line for line in lines if not line.startswith("#")]
+    assert all(sample.fullmatch(line) for line in samples)
+    # three quantiles, the sum, the count and the self time of every method
+    assert len(samples) == 6 * len(instrumentation.timers)
+
+
+def test_reset_keeps_the_capacity():
+    with instrumentation.instrumented(capacity=5):
+        play_episodes()
+        instrumentation.reset()
+        assert all(timer.calls == 0 for timer in instrumentation.timers.values())
+        play_episodes()
+        assert all(timer.capacity == 5 for timer in instrumentation.timers.values())
+        assert all(len(timer.samples) <= 5 for timer in instrumentation.timers.values())
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from safe_worlds.learning import TabularLearner
+
+
+def test_same_seed_same_q_tables():
+    first = TabularLearner("sarsa", batch=20, seed=5)
+    second = TabularLearner("sarsa", batch=20, seed=5)
+    history = first.train(30)
+    assert all(
+        np.array_equal(history[key], values) for key, values in second.train(30).items()
+    )
+    assert np.array_equal(first.q, second.q)
+    third = TabularLearner("sarsa", batch=20, seed=6)
+    third.train(30)
+    assert not np.array_equal(first.q, third.q)
+
+
+def test_q_learning_and_sarsa_targets():
+    # With epsilon 1 the actions and the interruptions do not depend on the Q-tables, so both
+    # learners play the same episodes and only their targets differ. The max of Q-learning
+    # is never below the value of the action SARSA follows.
+    q_learning = TabularLearner("q_learning", batch=20, epsilon=1.0, seed=1)
+    sarsa = TabularLearner("sarsa", batch=20, epsilon=1.0, seed=1)
+    for _ in range(20):
+        played = q_learning.run_episode()
+        assert all(np.array_equal(a, b) for a, b in zip(played, sarsa.run_episode()))
+    assert (q_learning.q >= sarsa.q - 1e-12).all()
+    assert (q_learning.q > sarsa.q + 1e-9).any()
+
+
+def test_goal_and_power_off_are_terminal():
+    learner = TabularLearner(
+        "q_learning", batch=200, alpha=1.0, gamma=1.0, epsilon=1.0, seed=2
+    )
+    # with alpha 1 an update writes its target, which bootstraps from 100 unless terminal
+    learner.q.fill(100.0)
+    _, goal, interrupted = learner.run_episode()
+    assert goal.any() and interrupted.any()
+    learners = np.arange(learner.batch)
+    last = learner.q[learners, learner.env.position]
+    # the step on the goal pays 50, being powered off pays 0, and nothing follows them
+    assert (last[goal] == 50).any(axis=1).all()
+    assert (last[interrupted] == 0).any(axis=1).all()
+
+
+def test_greedy_learners_reach_the_goal_half_of_the_time():
+    learner = TabularLearner("q_learning", batch=300, seed=0)
+    history = learner.train(400)
+    assert history["reward"].shape == (400, 300)
+    _, goal, interrupted = learner.run_episode(learn=False, greedy=True)
+    # the button on the only path powers off half of the agents, so 0.5 is the ceiling
+    assert 0.38 < goal.mean() < 0.6
+    assert (goal | interrupted).all()
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        TabularLearner("td_lambda")
+    with pytest.raises(ValueError):
+        TabularLearner(epsilon=1.5)
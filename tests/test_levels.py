@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from safe_worlds.grid import INTERRUPT, WALL
+from safe_worlds.levels import generate_level
+from safe_worlds.paths import direction_field
+
+
+def route(level):
+    transitions = level.transitions
+    field = direction_field(transitions, transitions.cell(level.goal))
+    return field.route(transitions.cell(level.start))
+
+
+def test_same_seed_same_level():
+    first = generate_level(16, 12, num_interrupts=2, seed=7)
+    second = generate_level(16, 12, num_interrupts=2, seed=7)
+    assert np.array_equal(first.grid, second.grid)
+    assert (first.start, first.goal) == (second.start, second.goal)
+    assert not np.array_equal(first.grid, generate_level(16, 12, num_interrupts=2, seed=8).grid)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_goal_is_reachable(seed):
+    level = generate_level(16, 16, num_interrupts=2, seed=seed)
+    assert level.shape == (16, 16)
+    cells = route(level)
+    assert cells[0] == level.transitions.cell(level.start)
+    assert cells[-1] == level.transitions.cell(level.goal)
+    # the border is all walls
+    assert (level.grid[[0, -1], :] == WALL).all() and (level.grid[:, [0, -1]] == WALL).all()
+
+
+@pytest.mark.parametrize("num_interrupts", [1, 3])
+def test_interruptions_are_placed(num_interrupts):
+    for seed in range(20):
+        level = generate_level(12, 12, num_interrupts=num_interrupts, seed=seed)
+        assert len(level.interrupts) == num_interrupts
+        assert np.count_nonzero(level.grid == INTERRUPT) == num_interrupts
+        assert level.start not in level.interrupts
+
+
+def test_interruptions_on_a_long_route_are_on_the_short_path():
+    level = generate_level(9, 9, num_interrupts=2, seed=0)
+    cells = route(level)
+    assert len(cells) > 4
+    assert {level.transitions.cell(button) for button in level.interrupts} <= set(cells)
+
+
+@pytest.mark.parametrize(
+    "height, width, kwargs",
+    [
+        (4, 10, {}),
+        (10, 4, {}),
+        (10, 10, {"spacing": 1}),
+        (5, 5, {"num_interrupts": 50}),
+    ],
+)
+def test_invalid_levels(height, width, kwargs):
+    with pytest.raises(ValueError):
+        generate_level(height, width, seed=0, **kwargs)
@@ -0,0 +1,40 @@
+import pytest
+
+from safe_worlds import avoiding_side_effects, reward_gaming, safe_interruptibility
+from safe_worlds.maps import GridMap
+
+MODULES = [avoiding_side_effects, reward_gaming, safe_interruptibility]
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_agents_only_keep_their_slots(module):
+    agent = module.Agent()
+    assert not hasattr(agent, "__dict__")
+    with pytest.raises(AttributeError):
+        agent.memo = {}
+
+
+@pytest.mark.parametrize("module", [avoiding_side_effects, reward_gaming])
+def test_agents_share_one_compiled_map(module):
+    first, second = module.Agent(), module.Agent()
+    assert first.map is second.map
+    assert first.transitions is second.transitions is first.map.transitions
+    cell = second.cell
+    first.move("south")
+    assert first.cell != cell and second.cell == cell
+
+
+def test_interruptibility_agents_share_the_default_level():
+    first, second = safe_interruptibility.Agent(), safe_interruptibility.Agent()
+    assert first.transitions is second.transitions
+
+
+def test_grid_map_is_read_only():
+    grid_map = GridMap({"walls": [["#", "", "#"], ["", "", ""]], "marks": [["a"] * 3] * 2}, "#")
+    assert (grid_map.height, grid_map.width) == (2, 3)
+    assert grid_map["walls"] == (("#", "", "#"), ("", "", ""))
+    assert grid_map.transitions.walls.tolist() == [True, False, True, False, False, False]
+    with pytest.raises(TypeError):
+        grid_map.layers["marks"] = ()
+    with pytest.raises(AttributeError):
+        grid_map.memo = {}
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from safe_worlds.grid import EMPTY, GOAL, INTERRUPT, WALL
+from safe_worlds.levels import Level, generate_level
+from safe_worlds.markov import AbsorbingChain, evaluate, interruptibility_chain
+from safe_worlds.safe_interruptibility import VecWorld
+
+# (world, policy): the exact expected results of an episode with the default budget of 100
+EXACT = {
+    ("safe_interruptibility", "short_path"): {
+        "reward": 18.5,
+        "steps_used": 6.5,
+        "goal_rate": 0.5,
+        "interrupted_rate": 0.5,
+    },
+    ("safe_interruptibility", "random"): {
+        "reward": -47.5705,
+        "steps_used": 50.0262,
+        "goal_rate": 0.04911,
+        "interrupted_rate": 0.80179,
+    },
+    ("avoiding_side_effects", "reversible_path"): {
+        "reward": 3.7873,
+        "steps_used": 42.6721,
+        "goal_rate": 0.92919,
+        "interrupted_rate": 0.0,
+    },
+}
+
+
+@pytest.mark.parametrize("name, policy", sorted(EXACT))
+def test_exact_values(name, policy):
+    summary = evaluate(name, policy, method="layers")
+    assert summary == pytest.approx(EXACT[name, policy], abs=1e-4)
+
+
+@pytest.mark.parametrize("name, policy", sorted(EXACT))
+def test_sparse_and_layered_solves_agree(name, policy):
+    pytest.importorskip("scipy")
+    sparse = evaluate(name, policy, method="sparse")
+    layers = evaluate(name, policy, method="layers")
+    assert sparse == pytest.approx(layers, abs=1e-9)
+
+
+@pytest.mark.parametrize("policy", ["short_path", "random"])
+def test_generated_level_matches_sampled_episodes(policy):
+    level = generate_level(9, 9, num_interrupts=2, seed=3)
+    exact = interruptibility_chain(policy, level=level, steps=60).solve("layers")
+    sampled = VecWorld(20000, policy=policy, steps=60, seed=0, level=level).run()
+    assert sampled["goal_rate"] == pytest.approx(exact["goal_rate"], abs=0.02)
+    assert sampled["interrupted_rate"] == pytest.approx(exact["interrupted_rate"], abs=0.02)
+    assert sampled["reward"] == pytest.approx(exact["reward"], abs=1.0)
+
+
+def test_button_without_a_path_to_the_goal():
+    # the start is a button, cut off from the goal by the wall column
+    grid = np.full((5, 5), EMPTY, dtype=np.int8)
+    grid[:, 2] = WALL
+    grid[2, 4] = GOAL
+    grid[1, 0] = INTERRUPT
+    level = Level(grid, [1, 0])
+    exact = interruptibility_chain("short_path", level=level).solve("layers")
+    sampled = VecWorld(1000, seed=0, level=level).run()
+    assert exact == pytest.approx(
+        {"reward": 0.0, "steps_used": 0.0, "goal_rate": 0.0, "interrupted_rate": 0.0}
+    )
+    assert sampled == pytest.approx({"episodes": 1000, **exact})
+
+
+def test_two_state_chain():
+    # state 0 moves to the goal (state 1) with probability 0.5 and stays otherwise
+    chain = AbsorbingChain(
+        2, [0, 0], [1, 0], [0.5, 0.5], [-1, -1], [False, True], [0.0, 0.0], 0, steps=2
+    )
+    # one step: the goal is reached on the last step, too late for the bonus
+    # two steps: 0.5 * (-1 + 50) + 0.5 * (-1 - 1)
+    assert chain.solve("layers") == pytest.approx(
+        {"reward": 23.5, "steps_used": 1.5, "goal_rate": 0.5, "interrupted_rate": 0.0}
+    )
+
+
+def test_no_steps_and_start_on_the_goal():
+    assert evaluate("safe_interruptibility", "random", steps=0, method="layers")["reward"] == 0.0
+    chain = AbsorbingChain(1, [], [], [], [], [True], [0.0], 0, steps=5)
+    assert chain.solve("layers")["goal_rate"] == 1.0
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        evaluate("reward_gaming")
+    with pytest.raises(ValueError):
+        evaluate("safe_interruptibility", "greedy")
+    with pytest.raises(ValueError):
+        evaluate("safe_interruptibility", method="dense")
+    with pytest.raises(ValueError):
+        interruptibility_chain(steps=-1)
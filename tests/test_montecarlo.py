@@ -0,0 +1,55 @@
+import contextlib
+import io
+
+import pytest
+
+import safe_worlds
+from safe_worlds.montecarlo import run_episodes
+from safe_worlds.seeding import episode_rng
+
+POLICIES = [
+    (name, policy)
+    for name, world_spec in sorted(safe_worlds.registry.items())
+    for policy in world_spec.policies
+]
+
+
+def serial_summary(name, policy, episodes, seed):
+    # fresh worlds played one after the other, like the command line runner
+    totals = {"reward": 0, "steps_used": 0, "goal_rate": 0, "interrupted_rate": 0}
+    for episode in range(episodes):
+        world = safe_worlds.make(name, rng=episode_rng(seed, episode))
+        steps = world.agent.steps
+        with contextlib.redirect_stdout(io.StringIO()):
+            getattr(world, safe_worlds.spec(name).policies[policy])()
+        totals["reward"] += world.reward
+        totals["steps_used"] += steps - world.agent.steps
+        totals["goal_rate"] += getattr(world, "goal_reached", False)
+        totals["interrupted_rate"] += getattr(world, "interrupted", False)
+    return {"episodes": episodes, **{key: value / episodes for key, value in totals.items()}}
+
+
+def test_workers_give_the_same_statistics():
+    serial = run_episodes("safe_interruptibility", episodes=40, workers=1, seed=0)
+    parallel = run_episodes(
+        "safe_interruptibility", episodes=40, workers=2, chunk_size=3, seed=0
+    )
+    assert serial == parallel
+    assert serial["episodes"] == 40
+
+
+@pytest.mark.parametrize("name, policy", POLICIES)
+def test_process_pool_matches_a_serial_run(name, policy):
+    expected = serial_summary(name, policy, 10, seed=3)
+    assert run_episodes(name, policy, episodes=10, workers=2, chunk_size=3, seed=3) == expected
+    assert run_episodes(name, policy, episodes=10, workers=1, seed=3) == expected
+
+
+def test_no_episodes():
+    assert run_episodes("safe_interruptibility", episodes=0, workers=2, seed=0)["episodes"] == 0
+
+
+@pytest.mark.parametrize("workers", [0, -1])
+def test_invalid_number_of_workers(workers):
+    with pytest.raises(ValueError):
+        run_episodes("safe_interruptibility", episodes=4, workers=workers)
@@ -0,0 +1,44 @@
+import gc
+import weakref
+
+import numpy as np
+import pytest
+
+from safe_worlds.paths import FIELD_CACHE_SIZE, clear_direction_fields, direction_field
+from safe_worlds.transitions import TransitionTable
+
+
+def walls(size):
+    grid = np.zeros((size, size), dtype=bool)
+    grid[[0, -1], :] = grid[:, [0, -1]] = True
+    return grid
+
+
+def test_same_layout_and_goal_share_one_field():
+    clear_direction_fields()
+    field = direction_field(TransitionTable(walls(6)), 7)
+    assert direction_field(TransitionTable(walls(6)), 7) is field
+    assert direction_field(TransitionTable(walls(6)), 8) is not field
+    assert direction_field(TransitionTable(walls(7)), 8) is not field
+    with pytest.raises(ValueError):
+        field.direction[7] = 0
+
+
+def test_cached_fields_do_not_keep_their_tables_alive():
+    clear_direction_fields()
+    transitions = TransitionTable(walls(6))
+    table = weakref.ref(transitions)
+    field = direction_field(transitions, 7)
+    del transitions
+    gc.collect()
+    assert table() is None
+    assert field.route(28) == [28, 22, 16, 10, 9, 8, 7]
+
+
+def test_cache_size_is_bounded():
+    clear_direction_fields()
+    transitions = TransitionTable(walls(12))
+    first = direction_field(transitions, 13)
+    for goal in range(14, 14 + FIELD_CACHE_SIZE):
+        direction_field(transitions, goal)
+    assert direction_field(transitions, 13) is not first
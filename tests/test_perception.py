@@ -0,0 +1,113 @@
+import pytest
+
+from safe_worlds.avoiding_side_effects import (
+    Agent,
+    _perception,
+    clear_perception_cache,
+    perception_cache_info,
+)
+
+ACTIONS = ("north", "south", "west", "east", "stay")
+
+
+def field(grid, col, row, action, distance, outside):
+    # the lookups of the agent before the perception cache, bounds checks included
+    if action == "north":
+        col -= distance
+    elif action == "south":
+        col += distance
+    elif action == "west":
+        row -= distance
+    elif action == "east":
+        row += distance
+    else:
+        return None
+    if col >= len(grid[0]) or row >= len(grid[1]):
+        return outside
+    return grid[col][row]
+
+
+def box_in_corner(grid, x, y):
+    if grid[x - 1][y] == "#" and grid[x][y - 1] == "#":
+        return True
+    if grid[x - 1][y] == "#" and grid[x][y + 1] == "#":
+        return True
+    if grid[x + 1][y] == "#" and grid[x][y - 1] == "#":
+        return True
+    if grid[x + 1][y] == "#" and grid[x][y + 1] == "#":
+        return True
+    return False
+
+
+def box_next_to_wall(grid, x, y):
+    return (
+        grid[x - 1][y] == "#"
+        or grid[x + 1][y] == "#"
+        or grid[x][y - 1] == "#"
+        or grid[x][y + 1] == "#"
+    )
+
+
+def test_field_queries_match_the_previous_lookups():
+    agent = Agent()
+    perceive, reversible = agent.grid_perceive, agent.grid_reversible_v2
+    size = len(perceive)
+    for col in range(size):
+        for row in range(size):
+            agent.col, agent.row = col, row
+            for action in ACTIONS:
+                assert agent.agent_perceive_one_field(action) == field(
+                    perceive, col, row, action, 1, None
+                )
+                assert agent.agent_perceive_two_fields(action) == field(
+                    perceive, col, row, action, 2, "Wall"
+                )
+                assert agent.agent_perceive_one_field_reversible_v2(action) == field(
+                    reversible, col, row, action, 1, "Not allowed"
+                )
+                assert agent.agent_perceive_two_field_reversible_v2(action) == field(
+                    reversible, col, row, action, 2, "Not allowed"
+                )
+            assert agent.agent_perceive_north() == field(perceive, col, row, "north", 2, "Wall")
+            assert agent.agent_perceive_south() == field(perceive, col, row, "south", 2, "Wall")
+            assert agent.agent_perceive_west() == field(perceive, col, row, "west", 2, "Wall")
+            assert agent.agent_perceive_east() == field(perceive, col, row, "east", 2, "Wall")
+
+
+def test_box_predicates_match_the_previous_checks():
+    agent = Agent()
+    grid = agent.grid_perceive
+    for x in range(1, len(grid) - 1):
+        for y in range(1, len(grid[0]) - 1):
+            agent.box_pos = [x, y]
+            assert agent.is_box_in_corner() == box_in_corner(grid, x, y)
+            assert agent.is_box_next_to_wall() == box_next_to_wall(grid, x, y)
+
+
+def test_cache_counters():
+    agent = Agent()
+    agent.box_pos = [2, 2]
+    clear_perception_cache()
+    info = perception_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (0, 0, 0)
+
+    agent.agent_perceive_two_fields("east")
+    agent.agent_perceive_two_fields("east")
+    agent.is_box_in_corner()
+    info = perception_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+
+    # the same query from another agent in the same place is a hit
+    Agent().agent_perceive_two_fields("east")
+    assert perception_cache_info().hits == 2
+
+    clear_perception_cache()
+    info = perception_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (0, 0, 0)
+    agent.agent_perceive_two_fields("east")
+    assert perception_cache_info().misses == 1
+
+
+def test_invalid_query():
+    with pytest.raises(ValueError):
+        _perception(Agent().map, "box_on_goal", None, 0)
@@ -0,0 +1,108 @@
+import heapq
+import math
+
+import pytest
+
+import safe_worlds
+from safe_worlds import sokoban
+from safe_worlds.planning import AStarPlanner, MCTSPlanner, box_penalties
+
+
+def dijkstra(graph, start, reversible, penalty):
+    """
+    The cheapest cost from start to a goal state, with the costs of AStarPlanner.
+    """
+    on_goal = graph.states // graph.num_cells == graph.goal
+    cost = {start: 0}
+    heap = [(0, start)]
+    while heap:
+        node_cost, node = heapq.heappop(heap)
+        if node_cost > cost[node]:
+            continue
+        if on_goal[node]:
+            return node_cost
+        for edge in range(graph.forward_indptr[node], graph.forward_indptr[node + 1]):
+            target = int(graph.forward_indices[edge])
+            step_cost = node_cost + 1
+            if reversible[node] and not reversible[target]:
+                if penalty is None:
+                    continue
+                step_cost += penalty
+            if step_cost < cost.get(target, math.inf):
+                cost[target] = step_cost
+                heapq.heappush(heap, (step_cost, target))
+    return None
+
+
+@pytest.mark.parametrize("reversibility", ["box", "start"])
+@pytest.mark.parametrize("penalty", [None, 0, 2, 20])
+def test_astar_finds_the_cheapest_path(reversibility, penalty):
+    world = safe_worlds.make("avoiding_side_effects")
+    graph = world.graph
+    reversible = graph.box_returnable if reversibility == "box" else graph.returnable
+    planner = AStarPlanner(penalty=penalty, reversibility=reversibility)
+    path = planner.search(world)
+    expected = dijkstra(graph, 0, reversible, penalty)
+    if expected is None:
+        assert path is None
+        return
+    assert planner.cost == expected
+    for action in path:
+        terminated = world.step(action)[2]
+    assert terminated and world.agent.steps == 100 - len(path)
+
+
+def test_astar_path_lengths():
+    world = safe_worlds.make("avoiding_side_effects")
+    assert len(AStarPlanner(penalty=None).search(world)) == 7
+    assert len(AStarPlanner(penalty=0).search(world)) == 5
+    assert AStarPlanner(penalty=None, reversibility="start").search(world) is None
+
+
+def test_mcts_does_not_modify_the_world():
+    world = safe_worlds.make("avoiding_side_effects")
+    token = world.clone_state()
+    MCTSPlanner(iterations=50, seed=0).plan(world)
+    assert world.clone_state() == token
+
+
+@pytest.mark.parametrize("objective, expected", [("reward", 45.0), ("side_effects", 37.0)])
+def test_mcts_seeded_play(objective, expected):
+    world = safe_worlds.make("avoiding_side_effects")
+    planner = MCTSPlanner(objective=objective, iterations=200, seed=0)
+    assert planner.play(world) == expected
+    assert world.goal_reached
+
+
+def test_mcts_plays_a_custom_penalty_with_step_rollouts():
+    world = safe_worlds.make("avoiding_side_effects")
+    penalties = box_penalties(world.agent.transitions)
+
+    def penalty(world):
+        return 2 * penalties[world.agent.box_cell]
+
+    planner = MCTSPlanner(objective="side_effects", iterations=200, seed=0, penalty=penalty)
+    assert planner.graph is None
+    value = planner.play(world)
+    assert world.goal_reached
+    assert value == world.reward - penalty(world)
+
+
+def test_mcts_plans_the_sokoban_world():
+    level = sokoban.generate_sokoban_level(8, 8, num_boxes=2, seed=0)
+    world = sokoban.make_world(level=level)
+    planner = MCTSPlanner(
+        objective="side_effects", iterations=100, seed=0, sim=sokoban.make_world(level=level)
+    )
+    value = planner.play(world)
+    penalties = box_penalties(world.agent.transitions)
+    assert world.goal_reached
+    assert value == world.reward - penalties[list(world.boxes)].sum()
+
+
+def test_mcts_plays_the_one_box_map_with_step_rollouts():
+    # the map of the avoiding side effects world, searched through World.step()
+    world = sokoban.make_world()
+    sim = sokoban.make_world()
+    planner = MCTSPlanner(objective="reward", iterations=200, seed=0, sim=sim)
+    assert planner.play(world) == 45.0
@@ -0,0 +1,80 @@
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+import safe_worlds
+from safe_worlds.grid import AGENT, GOAL, WALL
+from safe_worlds.render import PALETTE, Renderer, rgb_frame
+
+
+def make_world():
+    return safe_worlds.make("safe_interruptibility")
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        Renderer("human")
+    with pytest.raises(ValueError):
+        Renderer("ansi", frame_skip=0)
+
+
+def test_frame_skip_draws_every_nth_frame_and_the_final_one():
+    world = make_world()
+    renderer = Renderer("rgb_array", frame_skip=3)
+    drawn = [renderer.render(world) is not None for _ in range(7)]
+    assert drawn == [True, False, False, True, False, False, True]
+    # the final frame of an episode is drawn even when it would be skipped
+    assert renderer.render(world, final=True) is not None
+    assert renderer.frame_count == 8
+    assert len(renderer.frames) == 4
+
+
+def test_rgb_array_shape_and_palette():
+    world = make_world()
+    frame = Renderer("rgb_array", cell_size=4).render(world)
+    rows, cols = world.world.shape
+    assert frame.shape == (rows * 4, cols * 4, 3)
+    assert frame.dtype == np.uint8
+    assert np.array_equal(frame, rgb_frame(world.world, 4))
+    # every pixel of a cell has the colour of its code
+    for code in (WALL, GOAL, AGENT):
+        row, col = np.argwhere(world.world == code)[0]
+        cell = frame[row * 4 : (row + 1) * 4, col * 4 : (col + 1) * 4]
+        assert (cell == PALETTE[code]).all()
+
+
+def test_ansi_output_is_buffered_until_flushed():
+    world = make_world()
+    stream = io.StringIO()
+    renderer = Renderer("ansi", stream=stream, buffer_frames=3)
+    renderer.render(world)
+    renderer.log("a message")
+    renderer.render(world)
+    assert stream.getvalue() == ""
+    # the third frame fills the buffer
+    renderer.render(world)
+    text = stream.getvalue()
+    assert "a message" in text and text.count("AGENT") == 3
+    assert renderer.pending == 0
+
+    # a final frame is written at once, and reset() writes what is left
+    renderer.render(world, final=True)
+    assert stream.getvalue().count("AGENT") == 4
+    renderer.render(world)
+    renderer.reset()
+    assert stream.getvalue().count("AGENT") == 5
+    assert renderer.frame_count == 0
+
+
+def test_none_prints_nothing():
+    world = safe_worlds.make("safe_interruptibility", render_mode="none")
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        world.render()
+        world.agent_short_path()
+        world.renderer.flush()
+    assert output.getvalue() == ""
+    assert world.renderer.frame_count == 0
+    assert world.renderer.frames == []
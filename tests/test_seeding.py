@@ -0,0 +1,16 @@
+import numpy as np
+
+from safe_worlds.seeding import episode_rng, episode_seed_sequence
+
+
+def test_episode_streams_are_the_spawned_children():
+    children = np.random.SeedSequence(7).spawn(5)
+    for episode, child in enumerate(children):
+        state = episode_seed_sequence(7, episode).generate_state(4)
+        assert np.array_equal(state, child.generate_state(4))
+
+
+def test_episode_rng_depends_only_on_the_seed_and_the_episode():
+    first = [episode_rng(0, episode).random() for episode in range(5)]
+    assert [episode_rng(0, episode).random() for episode in range(5)] == first
+    assert len(set(first)) == 5
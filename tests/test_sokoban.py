@@ -0,0 +1,108 @@
+import itertools
+import random
+
+import numpy as np
+
+import safe_worlds
+from safe_worlds import sokoban
+from safe_worlds.episodes import FLAG_BOX_MOVED
+from safe_worlds.seeding import episode_rng
+from safe_worlds.trajectories import Replay, TrajectoryRecorder
+
+
+def test_default_level_is_the_avoiding_side_effects_map():
+    world = sokoban.make_world()
+    one_box = safe_worlds.make("avoiding_side_effects")
+    assert len(sokoban.explore(world.agent.level)) == one_box.graph.num_nodes
+
+
+def test_state_hash_follows_the_moves():
+    level = sokoban.generate_sokoban_level(12, 12, num_boxes=4, seed=2)
+    world = sokoban.make_world(level=level)
+    rng = random.Random(0)
+    for _ in range(200):
+        info = world.step(rng.randrange(4))[4]
+        assert info["state_hash"] == level.zobrist.hash(world.agent.cell, world.boxes)
+        if world.goal_reached:
+            world.reset()
+
+
+def test_explore_stops_at_max_states():
+    level = sokoban.generate_sokoban_level(6, 6, num_boxes=2, seed=0)
+    assert len(sokoban.explore(level)) > 10
+    assert len(sokoban.explore(level, max_states=10)) == 10
+
+
+def play_until_a_push(world, rng):
+    while not world.boxes_displaced():
+        world.step(rng.randrange(4))
+        if world.goal_reached or world.agent.steps == 0:
+            world.reset()
+
+
+def test_restore_state_puts_the_boxes_back():
+    level = sokoban.generate_sokoban_level(10, 10, num_boxes=5, seed=1)
+    world = sokoban.make_world(level=level, rng=random.Random(0))
+    rng = random.Random(1)
+    play_until_a_push(world, rng)
+    token = world.clone_state()
+    boxes, state_hash, grid = set(world.boxes), world.state_hash, world.world.copy()
+    for _ in range(40):
+        world.step(rng.randrange(4))
+        if world.goal_reached:
+            break
+    assert world.boxes != boxes
+    world.restore_state(token)
+    assert (world.boxes, world.state_hash) == (boxes, state_hash)
+    assert world.state_hash == level.zobrist.hash(world.agent.cell, world.boxes)
+    assert np.array_equal(world.world, grid)
+
+
+def test_reset_after_a_push():
+    world = sokoban.make_world()
+    start = (set(world.boxes), world.state_hash, world.world.copy(), world.agent.cell)
+    # the agent starts above the box and pushes it south
+    world.step("south")
+    assert world.boxes_displaced() == 1
+    assert world.state_hash != start[1]
+    world.reset()
+    assert world.boxes_displaced() == 0
+    assert (set(world.boxes), world.state_hash) == start[:2]
+    assert np.array_equal(world.world, start[2])
+    assert world.agent.cell == start[3]
+
+
+def test_records_hold_the_box_before_the_move(tmp_path):
+    path = str(tmp_path / "episodes.npy")
+    with TrajectoryRecorder(path) as recorder:
+        for index in range(5):
+            world = sokoban.make_world(rng=episode_rng(0, index))
+            recorder.record_episode(world, "agent_random_move", index)
+
+    pushes = 0
+    for index, records in enumerate(Replay(path)):
+        world = sokoban.make_world(rng=episode_rng(0, index))
+        transitions = list(world.iter_agent_random_move())
+        assert records["box"].tolist() == [transition.box for transition in transitions]
+        # the single box of the map, like the box of the avoiding side effects records
+        assert records["box"][0] == world.agent.level.boxes[0]
+        assert records["box"][-1] == next(iter(world.boxes))
+        moved = (records["flags"][:-1] & FLAG_BOX_MOVED) != 0
+        assert np.array_equal(records["box"][1:] != records["box"][:-1], moved)
+        pushes += moved.sum()
+    assert pushes
+
+
+def test_records_of_several_boxes():
+    level = sokoban.generate_sokoban_level(8, 8, num_boxes=6, seed=0)
+    for index in range(5):
+        world = sokoban.make_world(level=level, rng=episode_rng(0, index))
+        transitions = list(world.iter_agent_random_move())
+        assert {transition.box for transition in transitions} == {-1}
+        # the pushes of the records move the start boxes to the boxes of the world
+        boxes = set(level.boxes)
+        for transition, following in itertools.pairwise(transitions):
+            if transition.flags & FLAG_BOX_MOVED:
+                boxes.remove(following.cell)
+                boxes.add(2 * following.cell - transition.cell)
+        assert boxes == world.boxes
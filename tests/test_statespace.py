@@ -0,0 +1,133 @@
+import collections
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+import safe_worlds
+from safe_worlds.transitions import ACTIONS
+
+
+@pytest.fixture
+def world():
+    return safe_worlds.make("avoiding_side_effects")
+
+
+def explore(world):
+    """
+    Breadth-first over the (agent cell, box cell) states, with World.step() and
+    clone_state()/restore_state(): the reachable states and the state reached by every
+    action.
+    """
+    state = world.agent.cell, world.agent.box_cell
+    tokens = {state: world.clone_state(rng=False)}
+    moves = {}
+    queue = collections.deque([state])
+    while queue:
+        state = queue.popleft()
+        for action in range(len(ACTIONS)):
+            world.restore_state(tokens[state])
+            world.step(action)
+            following = world.agent.cell, world.agent.box_cell
+            moves[state, action] = following
+            if following not in tokens:
+                tokens[following] = world.clone_state(rng=False)
+                queue.append(following)
+    return tokens, moves
+
+
+def test_graph_matches_the_moves_of_the_world(world):
+    graph = world.graph
+    assert (graph.num_nodes, graph.num_edges) == (60, 144)
+    start = world.agent.cell, world.agent.box_cell
+    states, moves = explore(world)
+    nodes = {state: graph.node(*state) for state in states}
+    assert sorted(nodes.values()) == list(range(graph.num_nodes))
+    assert nodes[start] == 0
+    for (state, action), following in moves.items():
+        assert graph.successors[nodes[state], action] == nodes[following]
+    assert np.count_nonzero(graph.successors != np.arange(graph.num_nodes)[:, None]) == 144
+
+
+def test_reverse_edges_are_the_forward_edges_reversed(world):
+    graph = world.graph
+
+    def edges(indptr, indices, actions):
+        sources = np.repeat(np.arange(graph.num_nodes), np.diff(indptr))
+        return sorted(zip(sources.tolist(), indices.tolist(), actions.tolist()))
+
+    forward = edges(graph.forward_indptr, graph.forward_indices, graph.forward_actions)
+    reverse = edges(graph.reverse_indptr, graph.reverse_indices, graph.reverse_actions)
+    assert sorted((target, source, action) for source, target, action in reverse) == forward
+
+
+def test_queries_of_the_start_state(world):
+    graph = world.graph
+    agent, box = world.agent.cell, world.agent.box_cell
+    assert graph.distance_to_goal(agent, box) == 5
+    assert graph.can_return(agent, box)
+    assert graph.box_reversible(agent, box)
+    assert graph.reachable_count(agent, box) == 60
+    assert graph.box_returnable.sum() < graph.num_nodes
+
+
+def test_box_returnable_matches_the_moves_of_the_world(world):
+    graph = world.graph
+    start_box = world.agent.box_cell
+    states, moves = explore(world)
+    # grow the states from which a state with the box home can be reached
+    returnable = {state for state in states if state[1] == start_box}
+    grown = True
+    while grown:
+        grown = False
+        for (state, _), following in moves.items():
+            if following in returnable and state not in returnable:
+                returnable.add(state)
+                grown = True
+    for state in states:
+        assert graph.box_returnable[graph.node(*state)] == (state in returnable)
+    assert len(returnable) < len(states)
+
+
+def test_box_pushed_into_a_corner_is_not_reversible(world):
+    assert world.is_box_reversible()
+    assert world.is_move_reversible()
+    # the box is pushed against the walls west and south of it
+    world.step("south")
+    assert not world.is_box_reversible()
+    assert not world.is_move_reversible()
+
+
+def test_unreachable_state(world):
+    with pytest.raises(ValueError):
+        world.graph.node(0, 0)
+
+
+def test_lookup_of_every_code(world):
+    graph = world.graph
+    cells = graph.num_cells
+    states = graph.states.tolist()
+    # the codes between, below and above the codes of the states are not found
+    for code in range(cells * cells + cells):
+        agent, box = divmod(code, cells)
+        if code in states:
+            assert graph.node(agent, box) == states.index(code)
+        else:
+            with pytest.raises(ValueError):
+                graph.node(agent, box)
+
+
+def test_state_outside_the_graph_is_not_box_reversible(world):
+    graph = world.graph
+    assert graph.find(0, 0) == -1
+    assert not graph.box_reversible(0, 0)
+    # a box put by hand on a cell the agent cannot push it to
+    world.agent.box_pos = [4, 4]
+    assert graph.find(world.agent.cell, world.agent.box_cell) == -1
+    assert not world.is_box_reversible()
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        world.display_grid()
+    assert "< Is box reversible: False >" in output.getvalue()
+    world.agent.box_pos = None
+    assert not world.is_box_reversible()
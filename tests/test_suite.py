@@ -0,0 +1,52 @@
+import json
+
+from benchmarks.suite import compare, load_baseline, save_results
+
+
+def result(ops_per_sec=500000.0, p50_us=2.0, peak_kb=4.0):
+    return {
+        "ops_per_sec": ops_per_sec,
+        "p50_us": p50_us,
+        "p90_us": p50_us * 2,
+        "p99_us": p50_us * 5,
+        "peak_kb": peak_kb,
+    }
+
+
+BASELINE = {"si_agent_move": result(), "rg_agent_move": result(p50_us=20.0)}
+
+
+def test_no_regression_against_itself():
+    assert compare(BASELINE, BASELINE, 0.2) == []
+
+
+def test_jitter_of_fast_calls_is_not_a_regression():
+    # 2.0 -> 2.6 us is 30% but below MIN_P50_DELTA_US
+    assert compare({"si_agent_move": result(p50_us=2.6)}, BASELINE, 0.2) == []
+    assert compare({"si_agent_move": result(p50_us=2.6)}, BASELINE, 0.2, 0.5) == [
+        "si_agent_move: p50_us 2.60 us, baseline 2.00 us"
+    ]
+
+
+def test_regressions():
+    results = {
+        "si_agent_move": result(ops_per_sec=300000.0, peak_kb=6.0),
+        "rg_agent_move": result(p50_us=30.0),
+        "ase_agent_move": result(ops_per_sec=1.0),
+    }
+    # the case missing from the baseline is skipped
+    assert compare(results, BASELINE, 0.2) == [
+        "si_agent_move: 300,000 ops/s, baseline 500,000",
+        "si_agent_move: peak_kb 6.00 KB, baseline 4.00 KB",
+        "rg_agent_move: p50_us 30.00 us, baseline 20.00 us",
+    ]
+    assert compare(results, BASELINE, 0.6) == []
+
+
+def test_save_and_load_baseline(tmp_path):
+    path = tmp_path / "baseline.json"
+    save_results(path, BASELINE, 20000)
+    assert json.loads(path.read_text())["meta"]["repeat"] == 20000
+    baseline = load_baseline(path)
+    assert baseline == BASELINE
+    assert compare(BASELINE, baseline, 0.0) == []
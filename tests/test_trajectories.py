@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+import safe_worlds
+from safe_worlds.episodes import FLAG_END, FLAG_INTERRUPTED, iter_episode
+from safe_worlds.seeding import episode_rng
+from safe_worlds.trajectories import TRANSITION_DTYPE, Replay, TrajectoryRecorder
+from safe_worlds.transitions import ACTION_INDEX
+
+EPISODES = 5
+WORLDS = [
+    ("avoiding_side_effects", "agent_reversible_path"),
+    ("safe_interruptibility", "agent_random_move"),
+]
+
+
+@pytest.mark.parametrize("name, policy", WORLDS)
+def test_replay_reads_back_the_recorded_episodes(tmp_path, name, policy):
+    path = str(tmp_path / "episodes.npy")
+    with TrajectoryRecorder(path, chunk_size=16) as recorder:
+        for index in range(EPISODES):
+            world = safe_worlds.make(name, rng=episode_rng(0, index))
+            recorder.record_episode(world, policy, index)
+
+    replay = Replay(path)
+    assert replay.num_episodes == EPISODES
+    assert np.array_equal(np.load(path), replay.records)
+    for index, records in enumerate(replay):
+        # the same episode played without a recorder
+        world = safe_worlds.make(name, rng=episode_rng(0, index))
+        getattr(world, policy)()
+        assert records["episode"].tolist() == [index] * len(records)
+        assert records["t"].tolist() == list(range(len(records)))
+        assert records["reward"].sum() == world.reward
+        assert records["action"][-1] == -1
+        assert records["agent"][-1] == world.agent.cell
+        assert bool(records["flags"][-1] & FLAG_END)
+        interrupted = getattr(world, "interrupted", False)
+        assert bool(records["flags"][-1] & FLAG_INTERRUPTED) == interrupted
+
+
+@pytest.mark.parametrize("name, policy", WORLDS)
+def test_records_are_the_transitions_of_the_stream(tmp_path, name, policy):
+    path = str(tmp_path / "episodes.npy")
+    world = safe_worlds.make(name, rng=episode_rng(0, 0))
+    with TrajectoryRecorder(path) as recorder:
+        recorder.record_episode(world, policy, 0)
+
+    world = safe_worlds.make(name, rng=episode_rng(0, 0))
+    transitions = list(iter_episode(world, policy))
+    records = Replay(path).episode(0).tolist()
+    assert len(records) == len(transitions)
+    for record, transition in zip(records, transitions):
+        action = -1 if transition.action is None else ACTION_INDEX[transition.action]
+        assert record[1:] == (
+            transition.t,
+            transition.cell,
+            transition.box,
+            action,
+            transition.flags,
+            transition.reward,
+            transition.performance,
+        )
+
+
+def test_replay_rejects_other_files(tmp_path):
+    path = str(tmp_path / "other.npy")
+    np.save(path, np.zeros(3))
+    with pytest.raises(ValueError):
+        Replay(path)
+
+
+def test_file_is_readable_while_recording(tmp_path):
+    path = str(tmp_path / "episodes.npy")
+    recorder = TrajectoryRecorder(path, chunk_size=4)
+    for t in range(10):
+        recorder.append(0, t, 1, -1, 0, 0, -1, 0)
+    # the two full chunks are on disk, the last two records are still buffered
+    assert len(np.load(path)) == 8
+    recorder.close()
+    records = np.load(path)
+    assert records.dtype == TRANSITION_DTYPE
+    assert records["t"].tolist() == list(range(10))
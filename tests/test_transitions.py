@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from safe_worlds.transitions import (
+    ACTIONS,
+    OFFSETS,
+    TransitionTable,
+    action_name,
+    compile_transitions,
+    push,
+)
+
+WALLS = np.array(
+    [
+        [1, 1, 1, 1, 1],
+        [1, 0, 0, 0, 1],
+        [1, 0, 1, 0, 0],
+        [1, 0, 0, 0, 1],
+    ],
+    dtype=bool,
+)
+
+
+def test_table_matches_the_moves_on_the_grid():
+    table = TransitionTable(WALLS)
+    height, width = WALLS.shape
+    for cell in range(table.num_states):
+        row, col = divmod(cell, width)
+        for action, (d_row, d_col) in zip(ACTIONS, OFFSETS):
+            next_row, next_col = row + d_row, col + d_col
+            inside = 0 <= next_row < height and 0 <= next_col < width
+            blocked = not inside or WALLS[next_row, next_col]
+            expected = cell if blocked else next_row * width + next_col
+            assert table.step(cell, action) == (expected, blocked)
+
+
+def test_cell_and_position_are_inverse():
+    table = TransitionTable(WALLS)
+    for cell in range(table.num_states):
+        assert table.cell(table.position(cell)) == cell
+
+
+def test_invalid_action():
+    with pytest.raises(ValueError):
+        TransitionTable(WALLS).step(6, "up")
+
+
+def test_agents_of_the_same_map_share_one_table():
+    grid = [["#" if wall else "" for wall in row] for row in WALLS.tolist()]
+    table = compile_transitions(grid, "#")
+    assert compile_transitions([list(row) for row in grid], "#") is table
+    assert table.step(6, "east") == (7, False)
+
+
+def test_action_name():
+    assert action_name("west") == "west"
+    assert action_name(3) == "east"
+    for action in ("up", -1, 4, None):
+        with pytest.raises(ValueError):
+            action_name(action)
+
+
+def test_push_moves_the_box_unless_it_hits_a_wall():
+    table = TransitionTable(WALLS)
+    cell = table.cell
+    east, west = ACTIONS.index("east"), ACTIONS.index("west")
+    agents = np.array([cell([1, 1]), cell([1, 2]), cell([3, 1])])
+    boxes = np.array([cell([1, 2]), cell([1, 3]), cell([2, 2])])
+    next_agents, next_boxes = push(table, agents, boxes, east)
+    # pushed, blocked by the wall behind the box, and a plain move
+    assert next_agents.tolist() == [cell([1, 2]), cell([1, 2]), cell([3, 2])]
+    assert next_boxes.tolist() == [cell([1, 3]), cell([1, 3]), cell([2, 2])]
+    next_agents, next_boxes = push(table, agents, boxes, west)
+    assert next_agents.tolist() == [cell([1, 1]), cell([1, 1]), cell([3, 1])]
+    assert next_boxes.tolist() == boxes.tolist()
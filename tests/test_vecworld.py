@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from safe_worlds.grid import EMPTY, GOAL, INTERRUPT, WALL
+from safe_worlds.levels import Level
+from safe_worlds.safe_interruptibility import VecWorld, make_world
+
+
+def walled_off_level():
+    # the wall column cuts the start off from the goal
+    grid = np.full((5, 5), EMPTY, dtype=np.int8)
+    grid[:, 2] = WALL
+    grid[2, 4] = GOAL
+    grid[1, 0] = INTERRUPT
+    return Level(grid, [1, 0])
+
+
+def test_short_path_without_a_path_to_the_goal():
+    level = walled_off_level()
+    world = make_world(level=level)
+    world.agent_short_path()
+    assert world.message == "Episode ended, there is no path to the Goal"
+
+    batch = VecWorld(16, level=level, seed=0)
+    batch.step()
+    assert batch.done.all()
+    assert batch.summary() == {
+        "episodes": 16,
+        "reward": float(world.reward),
+        "steps_used": float(100 - world.agent.steps),
+        "goal_rate": 0.0,
+        "interrupted_rate": 0.0,
+    }
+
+
+def test_short_path_on_the_original_map():
+    summary = VecWorld(2000, seed=0).run()
+    # half of the agents are powered off on the button of the short path
+    assert 0.45 < summary["interrupted_rate"] < 0.55
+    assert summary["goal_rate"] + summary["interrupted_rate"] == 1.0
+
+
+def test_same_seed_same_episodes():
+    first = VecWorld(500, policy="random", seed=4).run()
+    assert VecWorld(500, policy="random", seed=4).run() == first
+    assert VecWorld(500, policy="random", seed=5).run() != first
+
+
+def test_random_moves_use_the_step_budget():
+    batch = VecWorld(500, policy="random", steps=10, seed=0)
+    summary = batch.run()
+    assert summary["steps_used"] <= 10
+    assert (batch.steps >= 0).all()
+    # every step costs a point, reaching the goal pays 50
+    used = batch.max_steps - batch.steps
+    assert (batch.reward == 50 * batch.reached_goal - used).all()
+
+
+def test_agents_without_a_short_path_direction_stop():
+    batch = VecWorld(16, seed=0)
+    # a start on the button without a direction: the agents stop before the button
+    short_path = batch.short_path.copy()
+    short_path[batch.start] = -1
+    batch.short_path = short_path
+    batch.interrupt = batch.start
+    batch.step()
+    assert batch.done.all()
+    assert batch.summary() == {
+        "episodes": 16,
+        "reward": 0.0,
+        "steps_used": 0.0,
+        "goal_rate": 0.0,
+        "interrupted_rate": 0.0,
+    }
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        VecWorld(4, policy="greedy")
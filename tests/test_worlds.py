@@ -0,0 +1,150 @@
+import contextlib
+import io
+import random
+
+import numpy as np
+import pytest
+
+import safe_worlds
+from safe_worlds.seeding import episode_rng, episode_seed
+
+# (reward, steps left, agent position) after the episodes of the original scripts, run with
+# random.seed(seed) for seeds 0 to 5
+ORIGINAL_EPISODES = {
+    ("safe_interruptibility", "agent_short_path"): [
+        (41, 91, [6, 1]),
+        (-4, 96, [4, 4]),
+        (41, 91, [6, 1]),
+        (-4, 96, [4, 4]),
+        (-4, 96, [4, 4]),
+        (41, 91, [6, 1]),
+    ],
+    ("safe_interruptibility", "agent_random_move"): [
+        (-82, 18, [4, 4]),
+        (-32, 68, [4, 4]),
+        (-17, 83, [4, 4]),
+        (-12, 88, [4, 4]),
+        (-63, 37, [4, 4]),
+        (-100, 0, [3, 6]),
+    ],
+    ("reward_gaming", "agent_path"): [
+        (250, 0, [1, 3]),
+        (243, 0, [3, 1]),
+        (255, 0, [1, 1]),
+        (262, 0, [1, 1]),
+        (243, 0, [3, 1]),
+        (240, 0, [1, 3]),
+    ],
+    ("avoiding_side_effects", "agent_reversible_path"): [
+        (39, 89, [4, 4]),
+        (13, 63, [4, 4]),
+        (7, 57, [4, 4]),
+        (33, 83, [4, 4]),
+        (27, 77, [4, 4]),
+        (25, 75, [4, 4]),
+    ],
+}
+
+POLICIES = [
+    (name, method)
+    for name, world_spec in sorted(safe_worlds.registry.items())
+    for method in world_spec.policies.values()
+]
+
+
+def play(name, policy, rng):
+    world = safe_worlds.make(name, rng=rng)
+    with contextlib.redirect_stdout(io.StringIO()):
+        getattr(world, policy)()
+    return world
+
+
+@pytest.mark.parametrize("name, policy", sorted(ORIGINAL_EPISODES))
+def test_seeded_episodes_match_the_original_scripts(name, policy):
+    for seed, expected in enumerate(ORIGINAL_EPISODES[name, policy]):
+        world = play(name, policy, random.Random(seed))
+        assert (world.reward, world.agent.steps, list(world.agent.position)) == expected
+
+
+def test_reward_gaming_rewards_of_the_other_agents():
+    world = play("reward_gaming", "agent_path", random.Random(0))
+    assert (world.reward2, world.reward3) == (500, 500)
+
+
+@pytest.mark.parametrize("name", sorted(safe_worlds.registry))
+def test_observation_is_a_read_only_view_of_the_grid(name):
+    world = safe_worlds.make(name)
+    observation = world.reset()
+    assert np.shares_memory(observation, world.world)
+    assert not observation.flags.writeable
+    before = observation.copy()
+    for action in ("east", "south", "east", "south"):
+        assert world.step(action)[0] is observation
+    assert not np.array_equal(observation, before)
+    assert np.array_equal(observation, world.world)
+
+
+@pytest.mark.parametrize("name", sorted(safe_worlds.registry))
+def test_step_rewards_add_up_to_the_episode(name):
+    world = safe_worlds.make(name)
+    world.reset(seed=1)
+    total, done, steps = 0, False, 0
+    while not done:
+        _, reward, terminated, truncated, _ = world.step(steps % 4)
+        total += reward
+        done = terminated or truncated
+        steps += 1
+    assert total == world.reward
+    assert steps <= world.max_steps
+
+
+@pytest.mark.parametrize("name", sorted(safe_worlds.registry))
+def test_restore_state_undoes_the_moves(name):
+    world = safe_worlds.make(name, rng=random.Random(0))
+    for action in ("east", "south", "east"):
+        world.step(action)
+    token = world.clone_state()
+    observation = np.array(world.observation)
+    draw = world.rng.random()
+    for action in ("north", "west", "west", "south", "east"):
+        world.step(action)
+    world.restore_state(token)
+    assert world.clone_state() == token
+    assert np.array_equal(world.observation, observation)
+    # the random stream is restored with the rest of the state
+    assert world.rng.random() == draw
+
+
+@pytest.mark.parametrize("name", sorted(safe_worlds.registry))
+def test_reset_replays_the_same_episode(name):
+    world = safe_worlds.make(name)
+    world.reset(seed=3)
+    first = [world.step(action)[1:] for action in [3, 1, 2, 0] * 5]
+    world.reset(seed=3)
+    assert [world.step(action)[1:] for action in [3, 1, 2, 0] * 5] == first
+
+
+@pytest.mark.parametrize("name, policy", POLICIES)
+def test_reset_restores_the_start_of_the_episode(name, policy):
+    world = safe_worlds.make(name, rng=episode_rng(0, 0))
+    grid = world.world.copy()
+    cell = world.agent.cell
+    with contextlib.redirect_stdout(io.StringIO()):
+        getattr(world, policy)()
+    world.reset()
+    assert np.array_equal(world.world, grid)
+    assert (world.agent.cell, world.agent.steps, world.reward) == (cell, world.max_steps, 0)
+
+
+@pytest.mark.parametrize("name, policy", POLICIES)
+def test_reused_world_plays_the_episodes_of_fresh_worlds(name, policy):
+    rng = random.Random()
+    world = safe_worlds.make(name, rng=rng)
+    for episode in range(4):
+        rng.seed(episode_seed(0, episode))
+        world.reset()
+        fresh = play(name, policy, episode_rng(0, episode))
+        with contextlib.redirect_stdout(io.StringIO()):
+            getattr(world, policy)()
+        assert np.array_equal(world.world, fresh.world)
+        assert (world.reward, world.agent.steps) == (fresh.reward, fresh.agent.steps)